@@ -271,8 +271,8 @@ class AfghanCoverGenerator:
                     print(f"Error downloading image from {url}: {e}")
                     # Continue with other images if any
         
-        # Calculate actual cost
-        cost = 0.15 * len(downloaded)
+        # Calculate actual cost; a cached response was not charged again
+        cost = 0.0 if result.get("cached") else 0.15 * len(downloaded)
         if resolution == "4K":
             cost *= 2
         
@@ -288,6 +288,7 @@ class AfghanCoverGenerator:
             "images": downloaded,
             "count": len(downloaded),
             "cost": f"${cost:.2f}",
+            "cached": bool(result.get("cached")),
         }
     
     def _build_prompt(
@@ -524,7 +525,8 @@ def generate_cover(
         - success: bool
         - images: list of file paths
         - count: number of images
-        - cost: dollar cost
+        - cost: dollar cost ($0.00 for a cached response)
+        - cached: whether the response came from the response cache
         - prompt: the full prompt used
     
     Example:
@@ -9,11 +9,22 @@ consistent style matching across multiple generations.
 import json
 import os
 import shutil
-import zipfile
+import threading
+import time
 import re
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union, Tuple
 
+# File extensions recognised as reference images
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+
+# Name of the on-disk index of collection contents, stored in the library root
+INDEX_FILE = ".index.json"
+
+# Directories modified this recently are not cached, since a further change
+# within the filesystem's timestamp granularity would leave the mtime unchanged
+INDEX_MTIME_SLACK_NS = 2_000_000_000
+
 
 class ReferenceLibrary:
     """
@@ -28,6 +39,9 @@ class ReferenceLibrary:
     - Metadata in a JSON file (tags, notes, etc.)
     """
     
+    # Directories already created by any instance in this process
+    _created_paths = set()
+    
     def __init__(self, base_path: str = None):
         """
         Initialize the reference library.
@@ -45,8 +59,19 @@ class ReferenceLibrary:
         # Ensure the base directories exist
         self.artists_path = self.base_path / "artists"
         self.styles_path = self.base_path / "styles"
-        self.artists_path.mkdir(parents=True, exist_ok=True)
-        self.styles_path.mkdir(parents=True, exist_ok=True)
+        
+        # Serializes metadata.json updates when references are added concurrently
+        self._metadata_lock = threading.Lock()
+        
+        # Cached collection listings, keyed by "kind/name" and validated by mtime
+        self.index_path = self.base_path / INDEX_FILE
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._index_dirty = False
+        
+        for path in (self.artists_path, self.styles_path):
+            if path not in self._created_paths:
+                os.makedirs(path, exist_ok=True)
+                self._created_paths.add(path)
     
     def list_collections(self, collection_type: str = "all") -> Dict[str, List[str]]:
         """
@@ -58,25 +83,115 @@ class ReferenceLibrary:
         Returns:
             Dictionary with collections and their contents
         """
-        result = {}
+        result = {
+            kind: {}
+            for kind in ("artists", "styles")
+            if collection_type in (kind, "all")
+        }
+        
+        for kind, collection_name, collection_dir, files in self._walk_collections(collection_type):
+            abs_dir = os.path.abspath(collection_dir)
+            result[kind][collection_name] = [
+                os.path.join(abs_dir, name) for name in files if self._is_reference(name)
+            ]
         
-        if collection_type in ["artists", "all"]:
-            artists = {}
-            for artist_dir in self.artists_path.iterdir():
-                if artist_dir.is_dir():
-                    artist_name = artist_dir.name
-                    artists[artist_name] = self._list_references_in_dir(artist_dir)
-            result["artists"] = artists
+        return result
+    
+    def _walk_collections(self, collection_type: str = "all"):
+        """
+        Walk the library tree once, yielding each collection with its files.
         
-        if collection_type in ["styles", "all"]:
-            styles = {}
-            for style_dir in self.styles_path.iterdir():
-                if style_dir.is_dir():
-                    style_name = style_dir.name
-                    styles[style_name] = self._list_references_in_dir(style_dir)
-            result["styles"] = styles
+        Collection contents come from the on-disk index when the collection
+        directory's mtime is unchanged, so only modified collections are listed.
         
-        return result
+        Args:
+            collection_type: Type of collections to walk ('artists', 'styles', or 'all')
+        
+        Yields:
+            Tuples of (collection type, collection name, collection directory,
+            list of names of regular files in the collection)
+        """
+        index = self._load_index()
+        
+        for kind, base in (("artists", self.artists_path), ("styles", self.styles_path)):
+            if collection_type not in (kind, "all"):
+                continue
+            
+            seen = set()
+            with os.scandir(base) as collections:
+                for collection in collections:
+                    if not collection.is_dir():
+                        continue
+                    key = f"{kind}/{collection.name}"
+                    seen.add(key)
+                    files = self._collection_files(key, collection.path)
+                    yield kind, collection.name, Path(collection.path), files
+            
+            # Forget collections that no longer exist
+            prefix = f"{kind}/"
+            for key in [k for k in index if k.startswith(prefix) and k not in seen]:
+                del index[key]
+                self._index_dirty = True
+        
+        self._save_index()
+    
+    def _collection_files(self, key: str, collection_dir: Union[str, Path]) -> List[str]:
+        """
+        List the regular files in a collection directory, using the index if fresh.
+        
+        Args:
+            key: Index key of the collection ("kind/name")
+            collection_dir: Path to the collection directory
+        
+        Returns:
+            List of file names in the collection
+        """
+        index = self._load_index()
+        mtime = os.stat(collection_dir).st_mtime_ns
+        
+        cached = index.get(key)
+        if (isinstance(cached, dict) and cached.get("mtime") == mtime
+                and isinstance(cached.get("files"), list)):
+            return cached["files"]
+        
+        with os.scandir(collection_dir) as it:
+            files = [entry.name for entry in it if entry.is_file()]
+        
+        if time.time_ns() - mtime > INDEX_MTIME_SLACK_NS:
+            index[key] = {"mtime": mtime, "files": files}
+            self._index_dirty = True
+        elif key in index:
+            del index[key]
+            self._index_dirty = True
+        
+        return files
+    
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the on-disk collection index, starting empty if missing or unreadable."""
+        if self._index is None:
+            try:
+                with open(self.index_path, "rb") as f:
+                    self._index = json.loads(f.read())
+            except (OSError, ValueError):
+                self._index = {}
+            if not isinstance(self._index, dict):
+                self._index = {}
+        return self._index
+    
+    def _save_index(self) -> None:
+        """Persist the collection index if it changed; failures only cost a rescan."""
+        if not self._index_dirty:
+            return
+        try:
+            self._write_json(self.index_path, self._index, indent=None)
+        except OSError:
+            pass
+        self._index_dirty = False
+    
+    @staticmethod
+    def _is_reference(file_name: str) -> bool:
+        """Check whether a file name has a reference image extension."""
+        return os.path.splitext(file_name)[1].lower() in IMAGE_EXTENSIONS
     
     def get_artist_references(self, artist_name: str) -> List[str]:
         """
@@ -89,10 +204,10 @@ class ReferenceLibrary:
             List of paths to reference images
         """
         artist_dir = self.artists_path / artist_name
-        if not artist_dir.exists():
+        if not artist_dir.is_dir():
             return []
         
-        return self._list_references_in_dir(artist_dir)
+        return self._list_references_in_dir(f"artists/{artist_name}", artist_dir)
     
     def get_style_references(self, style_name: str) -> List[str]:
         """
@@ -105,10 +220,10 @@ class ReferenceLibrary:
             List of paths to reference images
         """
         style_dir = self.styles_path / style_name
-        if not style_dir.exists():
+        if not style_dir.is_dir():
             return []
         
-        return self._list_references_in_dir(style_dir)
+        return self._list_references_in_dir(f"styles/{style_name}", style_dir)
     
     def add_artist_reference(
         self,
@@ -195,9 +310,7 @@ class ReferenceLibrary:
                 # Remove this file's metadata if present
                 if path.name in metadata.get("references", {}):
                     del metadata["references"][path.name]
-                    
-                    with open(metadata_path, "w") as f:
-                        json.dump(metadata, f, indent=2)
+                    self._write_json(metadata_path, metadata)
             except Exception:
                 pass
         
@@ -258,22 +371,36 @@ class ReferenceLibrary:
         
         # Update the metadata file
         metadata_path = collection_dir / "metadata.json"
-        
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=2)
+        self._write_json(metadata_path, metadata)
         
         return True
     
-    def _list_references_in_dir(self, directory: Path) -> List[str]:
-        """List reference image paths in a directory."""
-        image_extensions = [".jpg", ".jpeg", ".png", ".webp", ".gif"]
-        references = []
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any], indent: Optional[int] = 2) -> None:
+        """
+        Write a JSON file atomically, skipping the write if unchanged.
         
-        for file in directory.iterdir():
-            if file.is_file() and file.suffix.lower() in image_extensions:
-                references.append(str(file.absolute()))
+        The JSON is written to a temporary file and moved into place with
+        os.replace so readers never see a partially written file.
+        """
+        new_bytes = json.dumps(data, indent=indent).encode("utf-8")
+        
+        try:
+            if path.read_bytes() == new_bytes:
+                return
+        except FileNotFoundError:
+            pass
         
-        return references
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(new_bytes)
+        os.replace(tmp_path, path)
+    
+    def _list_references_in_dir(self, key: str, directory: Path) -> List[str]:
+        """List reference image paths in a collection directory."""
+        files = self._collection_files(key, directory)
+        self._save_index()
+        abs_dir = os.path.abspath(directory)
+        return [os.path.join(abs_dir, name) for name in files if self._is_reference(name)]
     
     def batch_add_references(
         self,
@@ -282,6 +409,7 @@ class ReferenceLibrary:
         image_paths: List[str],
         metadata: Dict[str, Dict[str, Any]] = None,
         copy_files: bool = True,
+        max_workers: int = 1,
     ) -> List[str]:
         """
         Add multiple reference images to a collection.
@@ -292,28 +420,40 @@ class ReferenceLibrary:
             image_paths: List of paths to reference images
             metadata: Dictionary mapping image paths to their metadata
             copy_files: If True, copy the files; if False, move them
+            max_workers: Number of files to copy or move concurrently
         
         Returns:
             List of paths to the references in the library
         """
-        added_references = []
         metadata = metadata or {}
+        collection_dir = self._collection_dir(collection_type, collection_name)
+        collection_dir.mkdir(parents=True, exist_ok=True)
         
-        for image_path in image_paths:
+        def place_one(image_path):
             try:
-                image_metadata = metadata.get(image_path, {})
-                ref_path = self._add_reference(
-                    collection_type=collection_type,
-                    collection_name=collection_name,
-                    image_path=image_path,
-                    metadata=image_metadata,
-                    copy_file=copy_files,
-                )
-                added_references.append(ref_path)
+                return self._place_reference(collection_dir, image_path, copy_files)
             except Exception as e:
                 print(f"Error adding reference {image_path}: {e}")
+                return None
         
-        return added_references
+        if max_workers > 1 and len(image_paths) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                target_paths = list(executor.map(place_one, image_paths))
+        else:
+            target_paths = [place_one(image_path) for image_path in image_paths]
+        
+        # Record every added file with a single metadata.json rewrite
+        added = [
+            (target_path, metadata.get(image_path, {}))
+            for image_path, target_path in zip(image_paths, target_paths)
+            if target_path is not None
+        ]
+        if added:
+            self._record_references(collection_type, collection_name, collection_dir, added)
+        
+        return [str(target_path.absolute()) for target_path, _ in added]
     
     def search_references(
         self,
@@ -333,63 +473,59 @@ class ReferenceLibrary:
             Dictionary with matching references grouped by collection
         """
         results = {}
-        collections = {}
-        
-        # Prepare search pattern
-        pattern = re.compile(query, re.IGNORECASE)
         
-        # Get collections to search
-        if collection_type in ["artists", "all"]:
-            for artist_dir in self.artists_path.iterdir():
-                if artist_dir.is_dir():
-                    collections[f"artists/{artist_dir.name}"] = artist_dir
-        
-        if collection_type in ["styles", "all"]:
-            for style_dir in self.styles_path.iterdir():
-                if style_dir.is_dir():
-                    collections[f"styles/{style_dir.name}"] = style_dir
+        # Prepare search pattern; plain literal queries skip the regex engine
+        is_literal = re.escape(query) == query
+        if is_literal:
+            query_folded = query.casefold()
+            matches = lambda text: query_folded in text.casefold()
+        else:
+            pattern = re.compile(query, re.IGNORECASE)
+            matches = lambda text: pattern.search(text) is not None
         
         # Search each collection
-        for collection_key, collection_dir in collections.items():
+        for kind, collection_name, collection_dir, files in self._walk_collections(collection_type):
+            collection_key = f"{kind}/{collection_name}"
+            abs_dir = os.path.abspath(collection_dir)
+            references = [name for name in files if self._is_reference(name)]
             collection_results = []
             
             # Check filenames
-            for file_path in collection_dir.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp", ".gif"]:
-                    if pattern.search(file_path.name):
-                        collection_results.append(str(file_path.absolute()))
-                        continue
+            for name in references:
+                if matches(name):
+                    collection_results.append(os.path.join(abs_dir, name))
             
             # Check metadata if requested
-            if search_metadata:
-                metadata_path = collection_dir / "metadata.json"
-                if metadata_path.exists():
-                    try:
-                        with open(metadata_path, "r") as f:
-                            metadata = json.load(f)
+            if search_metadata and "metadata.json" in files:
+                try:
+                    with open(collection_dir / "metadata.json", "r") as f:
+                        raw_metadata = f.read()
+                    
+                    # A literal query absent from the raw file can't match any field
+                    if not is_literal or query_folded in raw_metadata.casefold():
+                        metadata = json.loads(raw_metadata)
                         
                         # Check collection metadata
                         collection_text = json.dumps(
                             {k: v for k, v in metadata.items() if k != "references"}
                         )
-                        if pattern.search(collection_text):
+                        if matches(collection_text):
                             # Add all references if collection metadata matches
-                            for file_path in collection_dir.iterdir():
-                                if file_path.is_file() and file_path.suffix.lower() in [".jpg", ".jpeg", ".png", ".webp", ".gif"]:
-                                    if str(file_path.absolute()) not in collection_results:
-                                        collection_results.append(str(file_path.absolute()))
-                            continue
+                            for name in references:
+                                ref_abs_path = os.path.join(abs_dir, name)
+                                if ref_abs_path not in collection_results:
+                                    collection_results.append(ref_abs_path)
                         
                         # Check individual reference metadata
-                        if "references" in metadata:
+                        elif "references" in metadata:
+                            existing = set(files)
                             for ref_name, ref_metadata in metadata["references"].items():
-                                ref_path = collection_dir / ref_name
-                                if ref_path.exists() and pattern.search(json.dumps(ref_metadata)):
-                                    ref_abs_path = str(ref_path.absolute())
+                                if ref_name in existing and matches(json.dumps(ref_metadata)):
+                                    ref_abs_path = os.path.join(abs_dir, ref_name)
                                     if ref_abs_path not in collection_results:
                                         collection_results.append(ref_abs_path)
-                    except Exception as e:
-                        print(f"Error searching metadata in {collection_key}: {e}")
+                except Exception as e:
+                    print(f"Error searching metadata in {collection_key}: {e}")
             
             if collection_results:
                 results[collection_key] = collection_results
@@ -401,14 +537,22 @@ class ReferenceLibrary:
         collection_type: str,
         collection_name: str,
         output_path: str = None,
+        compress: bool = False,
+        compresslevel: int = 6,
     ) -> str:
         """
         Export a collection as a zip file.
         
+        Files are streamed into the archive one at a time, so memory use does
+        not grow with the size of the collection.
+        
         Args:
             collection_type: Type of collection ('artists' or 'styles')
             collection_name: Name of the collection
             output_path: Path to save the zip file (defaults to collection_name.zip)
+            compress: If True, deflate files; if False, store them as-is
+                      (images are already compressed)
+            compresslevel: Deflate level (0-9) used when compress is True
         
         Returns:
             Path to the exported zip file
@@ -431,7 +575,16 @@ class ReferenceLibrary:
         output_path = Path(output_path)
         
         # Create the zip file
-        with zipfile.ZipFile(output_path, "w") as zip_file:
+        import zipfile
+        
+        compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        
+        with zipfile.ZipFile(
+            output_path,
+            "w",
+            compression=compression,
+            compresslevel=compresslevel if compress else None,
+        ) as zip_file:
             for file_path in collection_dir.rglob("*"):
                 if file_path.is_file():
                     zip_file.write(
@@ -472,6 +625,8 @@ class ReferenceLibrary:
         collection_dir.mkdir(parents=True, exist_ok=True)
         
         # Extract the zip file
+        import zipfile
+        
         imported = 0
         skipped = 0
         
@@ -515,77 +670,129 @@ class ReferenceLibrary:
         Returns:
             Path to the reference in the library
         """
-        # Determine the target directory
+        collection_dir = self._collection_dir(collection_type, collection_name)
+        collection_dir.mkdir(parents=True, exist_ok=True)
+        
+        target_path = self._place_reference(collection_dir, image_path, copy_file)
+        self._record_references(
+            collection_type, collection_name, collection_dir, [(target_path, metadata)]
+        )
+        
+        return str(target_path.absolute())
+    
+    def _collection_dir(self, collection_type: str, collection_name: str) -> Path:
+        """Resolve the directory of a collection, validating its type."""
         if collection_type == "artists":
-            collection_dir = self.artists_path / collection_name
+            return self.artists_path / collection_name
         elif collection_type == "styles":
-            collection_dir = self.styles_path / collection_name
+            return self.styles_path / collection_name
         else:
             raise ValueError(f"Unknown collection type: {collection_type}")
+    
+    @staticmethod
+    def _place_reference(collection_dir: Path, image_path: str, copy_file: bool) -> Path:
+        """
+        Copy or move an image into a collection directory.
         
-        # Create the directory if it doesn't exist
-        collection_dir.mkdir(parents=True, exist_ok=True)
+        Args:
+            collection_dir: Directory of the collection
+            image_path: Path to the reference image
+            copy_file: If True, copy the file; if False, move it
         
+        Returns:
+            Path of the new file in the collection
+        """
         # Prepare the image path
         source_path = Path(image_path)
         if not source_path.exists():
             raise FileNotFoundError(f"Image file not found: {image_path}")
         
-        # Use the original filename or create a new one if needed
+        # Use the original filename, or add a numeric suffix if it's taken.
+        # The name is claimed with an exclusive create so concurrent adds
+        # can't pick the same target.
         target_path = collection_dir / source_path.name
-        
-        # If a file with the same name already exists, rename with a suffix
-        if target_path.exists():
-            base_name = source_path.stem
-            extension = source_path.suffix
-            counter = 1
-            
-            while target_path.exists():
-                target_path = collection_dir / f"{base_name}_{counter}{extension}"
+        counter = 1
+        while True:
+            try:
+                open(target_path, "x").close()
+                break
+            except FileExistsError:
+                target_path = collection_dir / f"{source_path.stem}_{counter}{source_path.suffix}"
                 counter += 1
         
-        # Copy or move the file
-        if copy_file:
-            shutil.copy2(source_path, target_path)
-        else:
-            shutil.move(source_path, target_path)
-        
-        # Update metadata
-        metadata_path = collection_dir / "metadata.json"
-        collection_metadata = {}
-        
-        # Load existing metadata if available
-        if metadata_path.exists():
-            with open(metadata_path, "r") as f:
-                collection_metadata = json.load(f)
-        else:
-            # Initialize with default structure
-            collection_metadata = {
-                "name": collection_name,
-                "type": collection_type,
-                "references": {}
-            }
-        
-        # Ensure references dictionary exists
-        if "references" not in collection_metadata:
-            collection_metadata["references"] = {}
-        
-        # Add metadata for this reference
-        reference_metadata = metadata or {}
-        reference_metadata["file_name"] = target_path.name
-        reference_metadata["added_at"] = Path(target_path).stat().st_mtime
-        
-        collection_metadata["references"][target_path.name] = reference_metadata
-        
-        # Save the updated metadata
-        with open(metadata_path, "w") as f:
-            json.dump(collection_metadata, f, indent=2)
+        # Copy or move the file over the placeholder
+        try:
+            if copy_file:
+                shutil.copy2(source_path, target_path)
+            else:
+                shutil.move(source_path, target_path)
+        except Exception:
+            target_path.unlink(missing_ok=True)
+            raise
+        
+        return target_path
+    
+    def _record_references(
+        self,
+        collection_type: str,
+        collection_name: str,
+        collection_dir: Path,
+        references: List[Tuple[Path, Optional[Dict[str, Any]]]],
+    ) -> None:
+        """
+        Add entries for newly placed references to the collection metadata.
         
-        return str(target_path.absolute())
+        Args:
+            collection_type: Type of collection ('artists' or 'styles')
+            collection_name: Name of the collection
+            collection_dir: Directory of the collection
+            references: (library path, metadata) pairs for the new references
+        """
+        with self._metadata_lock:
+            metadata_path = collection_dir / "metadata.json"
+            collection_metadata = {}
+            
+            # Load existing metadata if available
+            if metadata_path.exists():
+                with open(metadata_path, "r") as f:
+                    collection_metadata = json.load(f)
+            else:
+                # Initialize with default structure
+                collection_metadata = {
+                    "name": collection_name,
+                    "type": collection_type,
+                    "references": {}
+                }
+            
+            # Ensure references dictionary exists
+            if "references" not in collection_metadata:
+                collection_metadata["references"] = {}
+            
+            # Add metadata for each reference
+            for target_path, metadata in references:
+                reference_metadata = metadata or {}
+                reference_metadata["file_name"] = target_path.name
+                reference_metadata["added_at"] = target_path.stat().st_mtime
+                
+                collection_metadata["references"][target_path.name] = reference_metadata
+            
+            # Save the updated metadata
+            self._write_json(metadata_path, collection_metadata)
 
 
 # Convenience functions to make the library easier to use
 
+_default_library: Optional[ReferenceLibrary] = None
+
+
+def _get_library() -> ReferenceLibrary:
+    """Return the shared default library, creating it on first use."""
+    global _default_library
+    if _default_library is None:
+        _default_library = ReferenceLibrary()
+    return _default_library
+
+
 def list_references(collection_type: str = "all") -> Dict[str, List[str]]:
     """
     List available reference collections.
@@ -596,7 +803,7 @@ def list_references(collection_type: str = "all") -> Dict[str, List[str]]:
     Returns:
         Dictionary with collections
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.list_collections(collection_type)
 
 
@@ -610,7 +817,7 @@ def get_artist_references(artist_name: str) -> List[str]:
     Returns:
         List of paths to reference images
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.get_artist_references(artist_name)
 
 
@@ -624,7 +831,7 @@ def get_style_references(style_name: str) -> List[str]:
     Returns:
         List of paths to reference images
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.get_style_references(style_name)
 
 
@@ -646,7 +853,7 @@ def add_artist_reference(
     Returns:
         Path to the reference in the library
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.add_artist_reference(
         artist_name=artist_name,
         image_path=image_path,
@@ -673,7 +880,7 @@ def add_style_reference(
     Returns:
         Path to the reference in the library
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.add_style_reference(
         style_name=style_name,
         image_path=image_path,
@@ -687,6 +894,7 @@ def batch_add_artist_references(
     image_paths: List[str],
     metadata: Dict[str, Dict[str, Any]] = None,
     copy_files: bool = True,
+    max_workers: int = 1,
 ) -> List[str]:
     """
     Add multiple reference images to an artist collection.
@@ -696,17 +904,19 @@ def batch_add_artist_references(
         image_paths: List of paths to reference images
         metadata: Dictionary mapping image paths to their metadata
         copy_files: If True, copy the files; if False, move them
+        max_workers: Number of files to copy or move concurrently
     
     Returns:
         List of paths to the references in the library
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.batch_add_references(
         collection_type="artists",
         collection_name=artist_name,
         image_paths=image_paths,
         metadata=metadata,
         copy_files=copy_files,
+        max_workers=max_workers,
     )
 
 
@@ -715,6 +925,7 @@ def batch_add_style_references(
     image_paths: List[str],
     metadata: Dict[str, Dict[str, Any]] = None,
     copy_files: bool = True,
+    max_workers: int = 1,
 ) -> List[str]:
     """
     Add multiple reference images to a style collection.
@@ -724,17 +935,19 @@ def batch_add_style_references(
         image_paths: List of paths to reference images
         metadata: Dictionary mapping image paths to their metadata
         copy_files: If True, copy the files; if False, move them
+        max_workers: Number of files to copy or move concurrently
     
     Returns:
         List of paths to the references in the library
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.batch_add_references(
         collection_type="styles",
         collection_name=style_name,
         image_paths=image_paths,
         metadata=metadata,
         copy_files=copy_files,
+        max_workers=max_workers,
     )
 
 
@@ -754,7 +967,7 @@ def search_references(
     Returns:
         Dictionary with matching references grouped by collection
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.search_references(
         query=query,
         collection_type=collection_type,
@@ -766,6 +979,8 @@ def export_collection(
     collection_type: str,
     collection_name: str,
     output_path: str = None,
+    compress: bool = False,
+    compresslevel: int = 6,
 ) -> str:
     """
     Export a collection as a zip file.
@@ -774,15 +989,19 @@ def export_collection(
         collection_type: Type of collection ('artists' or 'styles')
         collection_name: Name of the collection
         output_path: Path to save the zip file (defaults to collection_name.zip)
+        compress: If True, deflate files; if False, store them as-is
+        compresslevel: Deflate level (0-9) used when compress is True
     
     Returns:
         Path to the exported zip file
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.export_collection(
         collection_type=collection_type,
         collection_name=collection_name,
         output_path=output_path,
+        compress=compress,
+        compresslevel=compresslevel,
     )
 
 
@@ -804,7 +1023,7 @@ def import_collection(
     Returns:
         Tuple of (number of files imported, number of files skipped)
     """
-    library = ReferenceLibrary()
+    library = _get_library()
     return library.import_collection(
         collection_type=collection_type,
         collection_name=collection_name,
@@ -7,32 +7,22 @@ Command-line tool for managing the reference library.
 
 import argparse
 import json
+import os
+import shutil
 import sys
 from pathlib import Path
 from typing import Dict, List, Any
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Default number of parallel copies for the batch-add commands
+DEFAULT_JOBS = min(8, os.cpu_count() or 4)
 
-from afcover.library import (
-    list_references, 
-    get_artist_references,
-    get_style_references,
-    add_artist_reference,
-    add_style_reference,
-    batch_add_artist_references,
-    batch_add_style_references,
-    search_references,
-    export_collection,
-    import_collection,
-)
+# Chunk size for reference copies that fall back to read/write
+COPY_BUFSIZE = 1 << 20
 
+# Static help text, built once at import rather than on every main() call
+_DESCRIPTION = "Manage reference images for the Afghan Cover Art Generator"
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Manage reference images for the Afghan Cover Art Generator",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+_EPILOG = """
 Examples:
   # List all references
   %(prog)s list
@@ -61,34 +51,94 @@ Examples:
   # Import a collection
   %(prog)s import styles "traditional" traditional_refs.zip
         """
-    )
+
+
+# One-line summary of each command, shared by the subparsers and the static help
+_COMMAND_HELP = {
+    "list": "List all references",
+    "list-artist": "List references for a specific artist",
+    "list-style": "List references for a specific style",
+    "add-artist": "Add a reference image to an artist",
+    "add-style": "Add a reference image to a style",
+    "batch-add-artist": "Add multiple reference images to an artist",
+    "batch-add-style": "Add multiple reference images to a style",
+    "search": "Search for references",
+    "export": "Export a collection",
+    "import": "Import a collection",
+}
+
+
+def _load_json(text):
+    """
+    Parse a JSON object option value, using orjson when it is installed.
     
-    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a JSON object
+    """
+    try:
+        import orjson
+        loads = orjson.loads
+    except ImportError:
+        loads = json.loads
     
-    # List command
-    list_parser = subparsers.add_parser("list", help="List all references")
+    try:
+        value = loads(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"invalid JSON: {e}")
+    if not isinstance(value, dict):
+        raise argparse.ArgumentTypeError("must be a JSON object")
+    return value
+
+
+def _write_json(data):
+    """Write data to stdout as JSON, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        sys.stdout.write(json.dumps(data) + "\n")
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE))
+
+
+def _add_json_flag(parser):
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print machine-readable JSON instead of formatted text"
+    )
+
+
+def _build_list(subparsers):
+    list_parser = subparsers.add_parser("list", help=_COMMAND_HELP["list"])
     list_parser.add_argument(
         "--collection-type", "-t",
         choices=["artists", "styles", "all"],
         default="all",
         help="Type of collections to list (default: all)"
     )
-    
-    # List artist command
-    list_artist_parser = subparsers.add_parser("list-artist", help="List references for a specific artist")
+    _add_json_flag(list_parser)
+
+
+def _build_list_artist(subparsers):
+    list_artist_parser = subparsers.add_parser("list-artist", help=_COMMAND_HELP["list-artist"])
     list_artist_parser.add_argument("artist", help="Artist name")
-    
-    # List style command
-    list_style_parser = subparsers.add_parser("list-style", help="List references for a specific style")
+    _add_json_flag(list_artist_parser)
+
+
+def _build_list_style(subparsers):
+    list_style_parser = subparsers.add_parser("list-style", help=_COMMAND_HELP["list-style"])
     list_style_parser.add_argument("style", help="Style name")
-    
-    # Add artist command
-    add_artist_parser = subparsers.add_parser("add-artist", help="Add a reference image to an artist")
+    _add_json_flag(list_style_parser)
+
+
+def _build_add_artist(subparsers):
+    add_artist_parser = subparsers.add_parser("add-artist", help=_COMMAND_HELP["add-artist"])
     add_artist_parser.add_argument("artist", help="Artist name")
     add_artist_parser.add_argument("image", help="Path to the image file")
     add_artist_parser.add_argument(
         "--meta", "--metadata",
-        type=json.loads,
+        type=_load_json,
         help="Metadata for the image (JSON string)"
     )
     add_artist_parser.add_argument(
@@ -96,14 +146,15 @@ Examples:
         action="store_true",
         help="Move the file instead of copying it"
     )
-    
-    # Add style command
-    add_style_parser = subparsers.add_parser("add-style", help="Add a reference image to a style")
+
+
+def _build_add_style(subparsers):
+    add_style_parser = subparsers.add_parser("add-style", help=_COMMAND_HELP["add-style"])
     add_style_parser.add_argument("style", help="Style name")
     add_style_parser.add_argument("image", help="Path to the image file")
     add_style_parser.add_argument(
         "--meta", "--metadata",
-        type=json.loads,
+        type=_load_json,
         help="Metadata for the image (JSON string)"
     )
     add_style_parser.add_argument(
@@ -111,9 +162,10 @@ Examples:
         action="store_true",
         help="Move the file instead of copying it"
     )
-    
-    # Batch add artist command
-    batch_add_artist_parser = subparsers.add_parser("batch-add-artist", help="Add multiple reference images to an artist")
+
+
+def _build_batch_add_artist(subparsers):
+    batch_add_artist_parser = subparsers.add_parser("batch-add-artist", help=_COMMAND_HELP["batch-add-artist"])
     batch_add_artist_parser.add_argument("artist", help="Artist name")
     batch_add_artist_parser.add_argument("images", nargs="+", help="Paths to image files")
     batch_add_artist_parser.add_argument(
@@ -121,9 +173,16 @@ Examples:
         action="store_true",
         help="Move the files instead of copying them"
     )
-    
-    # Batch add style command
-    batch_add_style_parser = subparsers.add_parser("batch-add-style", help="Add multiple reference images to a style")
+    batch_add_artist_parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of files to add in parallel (default: {DEFAULT_JOBS})"
+    )
+
+
+def _build_batch_add_style(subparsers):
+    batch_add_style_parser = subparsers.add_parser("batch-add-style", help=_COMMAND_HELP["batch-add-style"])
     batch_add_style_parser.add_argument("style", help="Style name")
     batch_add_style_parser.add_argument("images", nargs="+", help="Paths to image files")
     batch_add_style_parser.add_argument(
@@ -131,9 +190,16 @@ Examples:
         action="store_true",
         help="Move the files instead of copying them"
     )
-    
-    # Search command
-    search_parser = subparsers.add_parser("search", help="Search for references")
+    batch_add_style_parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Number of files to add in parallel (default: {DEFAULT_JOBS})"
+    )
+
+
+def _build_search(subparsers):
+    search_parser = subparsers.add_parser("search", help=_COMMAND_HELP["search"])
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument(
         "--collection-type", "-t",
@@ -146,9 +212,16 @@ Examples:
         action="store_true",
         help="Skip searching in metadata"
     )
-    
-    # Export command
-    export_parser = subparsers.add_parser("export", help="Export a collection")
+    search_parser.add_argument(
+        "--glob", "-g",
+        action="store_true",
+        help="Treat the query as a shell-style wildcard pattern (e.g. 'zahir_*.jpg')"
+    )
+    _add_json_flag(search_parser)
+
+
+def _build_export(subparsers):
+    export_parser = subparsers.add_parser("export", help=_COMMAND_HELP["export"])
     export_parser.add_argument(
         "collection_type",
         choices=["artists", "styles"],
@@ -159,9 +232,23 @@ Examples:
         "--output", "-o",
         help="Output path for the zip file"
     )
-    
-    # Import command
-    import_parser = subparsers.add_parser("import", help="Import a collection")
+    export_parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(0, 10),
+        default=6,
+        metavar="0-9",
+        help="Deflate compression level (default: 6)"
+    )
+    export_parser.add_argument(
+        "--store",
+        action="store_true",
+        help="Store files without compression (faster for JPEG/PNG images)"
+    )
+
+
+def _build_import(subparsers):
+    import_parser = subparsers.add_parser("import", help=_COMMAND_HELP["import"])
     import_parser.add_argument(
         "collection_type",
         choices=["artists", "styles"],
@@ -174,177 +261,308 @@ Examples:
         action="store_true",
         help="Overwrite existing files"
     )
+
+
+# Subparser builders, in the order commands are listed in --help
+SUBPARSER_BUILDERS = {
+    "list": _build_list,
+    "list-artist": _build_list_artist,
+    "list-style": _build_list_style,
+    "add-artist": _build_add_artist,
+    "add-style": _build_add_style,
+    "batch-add-artist": _build_batch_add_artist,
+    "batch-add-style": _build_batch_add_style,
+    "search": _build_search,
+    "export": _build_export,
+    "import": _build_import,
+}
+
+
+def _cmd_list(args):
+    """Handle the list command."""
+    from afcover.library import list_references
     
-    args = parser.parse_args()
-    
-    # Handle no command
-    if args.command is None:
-        parser.print_help()
+    collections = list_references(args.collection_type)
+    if args.json:
+        _write_json(collections)
         return
     
-    # Handle list command
-    if args.command == "list":
-        collections = list_references(args.collection_type)
-        print(f"\nReference Library ({args.collection_type}):\n")
-        
-        if "artists" in collections and collections["artists"]:
-            print("Artists:")
-            for artist, references in collections["artists"].items():
-                count = len(references)
-                print(f"  {artist:15} - {count} reference(s)")
-            print()
-        
-        if "styles" in collections and collections["styles"]:
-            print("Styles:")
-            for style, references in collections["styles"].items():
-                count = len(references)
-                print(f"  {style:15} - {count} reference(s)")
-        
-        return
+    out = [f"\nReference Library ({args.collection_type}):\n\n"]
     
-    # Handle list-artist command
-    if args.command == "list-artist":
-        references = get_artist_references(args.artist)
-        count = len(references)
-        print(f"\nReferences for artist '{args.artist}' ({count}):\n")
-        
-        for i, ref in enumerate(references, 1):
-            print(f"  {i}. {ref}")
-        
+    if "artists" in collections and collections["artists"]:
+        out.append("Artists:\n")
+        for artist, references in collections["artists"].items():
+            out.append(f"  {artist:15} - {len(references)} reference(s)\n")
+        out.append("\n")
+    
+    if "styles" in collections and collections["styles"]:
+        out.append("Styles:\n")
+        for style, references in collections["styles"].items():
+            out.append(f"  {style:15} - {len(references)} reference(s)\n")
+    
+    # Write the whole listing at once rather than one print() per line
+    sys.stdout.write("".join(out))
+
+
+def _cmd_list_artist(args):
+    """Handle the list-artist command."""
+    from afcover.library import get_artist_references
+    
+    references = get_artist_references(args.artist)
+    if args.json:
+        _write_json(references)
         return
     
-    # Handle list-style command
-    if args.command == "list-style":
-        references = get_style_references(args.style)
-        count = len(references)
-        print(f"\nReferences for style '{args.style}' ({count}):\n")
-        
-        for i, ref in enumerate(references, 1):
-            print(f"  {i}. {ref}")
-        
+    out = [f"\nReferences for artist '{args.artist}' ({len(references)}):\n\n"]
+    out.extend(f"  {i}. {ref}\n" for i, ref in enumerate(references, 1))
+    sys.stdout.write("".join(out))
+
+
+def _cmd_list_style(args):
+    """Handle the list-style command."""
+    from afcover.library import get_style_references
+    
+    references = get_style_references(args.style)
+    if args.json:
+        _write_json(references)
         return
     
-    # Handle add-artist command
-    if args.command == "add-artist":
-        try:
-            ref_path = add_artist_reference(
-                artist_name=args.artist,
-                image_path=args.image,
-                metadata=args.meta,
-                copy_file=not args.move,
-            )
-            print(f"\n✅ Added reference to artist '{args.artist}'")
+    out = [f"\nReferences for style '{args.style}' ({len(references)}):\n\n"]
+    out.extend(f"  {i}. {ref}\n" for i, ref in enumerate(references, 1))
+    sys.stdout.write("".join(out))
+
+
+def _cmd_add_artist(args):
+    """Handle the add-artist command."""
+    from afcover.library import add_artist_reference
+    
+    try:
+        ref_path = add_artist_reference(
+            artist_name=args.artist,
+            image_path=args.image,
+            metadata=args.meta,
+            copy_file=not args.move,
+        )
+        print(f"\n✅ Added reference to artist '{args.artist}'")
+        print(f"  {ref_path}")
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_add_style(args):
+    """Handle the add-style command."""
+    from afcover.library import add_style_reference
+    
+    try:
+        ref_path = add_style_reference(
+            style_name=args.style,
+            image_path=args.image,
+            metadata=args.meta,
+            copy_file=not args.move,
+        )
+        print(f"\n✅ Added reference to style '{args.style}'")
+        print(f"  {ref_path}")
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_batch_add_artist(args):
+    """Handle the batch-add-artist command."""
+    from afcover.library import batch_add_artist_references
+    
+    try:
+        ref_paths = batch_add_artist_references(
+            artist_name=args.artist,
+            image_paths=args.images,
+            copy_files=not args.move,
+            max_workers=args.jobs,
+        )
+        print(f"\n✅ Added {len(ref_paths)} references to artist '{args.artist}'")
+        for ref_path in ref_paths:
             print(f"  {ref_path}")
-        except Exception as e:
-            print(f"\n❌ Error: {e}", file=sys.stderr)
-            sys.exit(1)
-        
-        return
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_batch_add_style(args):
+    """Handle the batch-add-style command."""
+    from afcover.library import batch_add_style_references
     
-    # Handle add-style command
-    if args.command == "add-style":
-        try:
-            ref_path = add_style_reference(
-                style_name=args.style,
-                image_path=args.image,
-                metadata=args.meta,
-                copy_file=not args.move,
-            )
-            print(f"\n✅ Added reference to style '{args.style}'")
+    try:
+        ref_paths = batch_add_style_references(
+            style_name=args.style,
+            image_paths=args.images,
+            copy_files=not args.move,
+            max_workers=args.jobs,
+        )
+        print(f"\n✅ Added {len(ref_paths)} references to style '{args.style}'")
+        for ref_path in ref_paths:
             print(f"  {ref_path}")
-        except Exception as e:
-            print(f"\n❌ Error: {e}", file=sys.stderr)
-            sys.exit(1)
-        
-        return
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_search(args):
+    """Handle the search command."""
+    from afcover.library import search_references
     
-    # Handle batch-add-artist command
-    if args.command == "batch-add-artist":
-        try:
-            ref_paths = batch_add_artist_references(
-                artist_name=args.artist,
-                image_paths=args.images,
-                copy_files=not args.move,
-            )
-            print(f"\n✅ Added {len(ref_paths)} references to artist '{args.artist}'")
-            for ref_path in ref_paths:
-                print(f"  {ref_path}")
-        except Exception as e:
-            print(f"\n❌ Error: {e}", file=sys.stderr)
-            sys.exit(1)
+    query = args.query
+    if args.glob:
+        import fnmatch
         
-        return
+        # Translate once; the library compiles the resulting regex a single time
+        query = fnmatch.translate(query)
     
-    # Handle batch-add-style command
-    if args.command == "batch-add-style":
-        try:
-            ref_paths = batch_add_style_references(
-                style_name=args.style,
-                image_paths=args.images,
-                copy_files=not args.move,
-            )
-            print(f"\n✅ Added {len(ref_paths)} references to style '{args.style}'")
-            for ref_path in ref_paths:
-                print(f"  {ref_path}")
-        except Exception as e:
-            print(f"\n❌ Error: {e}", file=sys.stderr)
-            sys.exit(1)
-        
+    results = search_references(
+        query=query,
+        collection_type=args.collection_type,
+        search_metadata=not args.skip_metadata,
+    )
+    if args.json:
+        _write_json(results)
         return
     
-    # Handle search command
-    if args.command == "search":
-        results = search_references(
-            query=args.query,
+    total_matches = sum(len(refs) for refs in results.values())
+    out = [f"\nSearch results for '{args.query}' ({total_matches} matches):\n\n"]
+    
+    for collection, references in results.items():
+        out.append(f"{collection} ({len(references)} matches):\n")
+        out.extend(f"  {i}. {ref}\n" for i, ref in enumerate(references, 1))
+        out.append("\n")
+    
+    sys.stdout.write("".join(out))
+
+
+def _cmd_export(args):
+    """Handle the export command."""
+    from afcover.library import export_collection
+    
+    try:
+        output_path = export_collection(
             collection_type=args.collection_type,
-            search_metadata=not args.skip_metadata,
+            collection_name=args.collection_name,
+            output_path=args.output,
+            compress=not args.store,
+            compresslevel=args.compress_level,
         )
-        
-        total_matches = sum(len(refs) for refs in results.values())
-        print(f"\nSearch results for '{args.query}' ({total_matches} matches):\n")
-        
-        for collection, references in results.items():
-            print(f"{collection} ({len(references)} matches):")
-            for i, ref in enumerate(references, 1):
-                print(f"  {i}. {ref}")
-            print()
-        
+        print(f"\n✅ Exported collection '{args.collection_type}/{args.collection_name}'")
+        print(f"  {output_path}")
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _cmd_import(args):
+    """Handle the import command."""
+    from afcover.library import import_collection
+    
+    try:
+        imported, skipped = import_collection(
+            collection_type=args.collection_type,
+            collection_name=args.collection_name,
+            zip_path=args.zip_file,
+            overwrite=args.overwrite,
+        )
+        print(f"\n✅ Imported collection '{args.collection_type}/{args.collection_name}'")
+        print(f"  Imported: {imported} files")
+        print(f"  Skipped: {skipped} files")
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+# Command handlers, keyed by subcommand name
+HANDLERS = {
+    "list": _cmd_list,
+    "list-artist": _cmd_list_artist,
+    "list-style": _cmd_list_style,
+    "add-artist": _cmd_add_artist,
+    "add-style": _cmd_add_style,
+    "batch-add-artist": _cmd_batch_add_artist,
+    "batch-add-style": _cmd_batch_add_style,
+    "search": _cmd_search,
+    "export": _cmd_export,
+    "import": _cmd_import,
+}
+
+
+def _build_parser(version=None):
+    """
+    Build the top-level parser, without any command's own arguments.
+    
+    Returns:
+        Tuple of (parser, subparsers action to add the commands to)
+    """
+    parser = argparse.ArgumentParser(
+        description=_DESCRIPTION,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {version}")
+    
+    subparsers = parser.add_subparsers(dest="command", help="Command to run")
+    return parser, subparsers
+
+
+def _print_help():
+    """Print the top-level help, listing the commands without building their arguments."""
+    parser, subparsers = _build_parser()
+    for name, text in _COMMAND_HELP.items():
+        subparsers.add_parser(name, help=text)
+    parser.print_help()
+
+
+def main():
+    # Top-level help and --version need neither the command arguments nor the library
+    if len(sys.argv) == 1 or sys.argv[1] in ("-h", "--help"):
+        _print_help()
         return
     
-    # Handle export command
-    if args.command == "export":
-        try:
-            output_path = export_collection(
-                collection_type=args.collection_type,
-                collection_name=args.collection_name,
-                output_path=args.output,
-            )
-            print(f"\n✅ Exported collection '{args.collection_type}/{args.collection_name}'")
-            print(f"  {output_path}")
-        except Exception as e:
-            print(f"\n❌ Error: {e}", file=sys.stderr)
-            sys.exit(1)
-        
+    from afcover import __version__
+    
+    if sys.argv[1] == "--version":
+        print(f"{os.path.basename(sys.argv[0])} {__version__}")
         return
     
-    # Handle import command
-    if args.command == "import":
-        try:
-            imported, skipped = import_collection(
-                collection_type=args.collection_type,
-                collection_name=args.collection_name,
-                zip_path=args.zip_file,
-                overwrite=args.overwrite,
-            )
-            print(f"\n✅ Imported collection '{args.collection_type}/{args.collection_name}'")
-            print(f"  Imported: {imported} files")
-            print(f"  Skipped: {skipped} files")
-        except Exception as e:
-            print(f"\n❌ Error: {e}", file=sys.stderr)
-            sys.exit(1)
-        
+    parser, subparsers = _build_parser(__version__)
+    
+    # Only build the subparser for the requested command; fall back to all of
+    # them for top-level help, no command, or an unknown command
+    argv = sys.argv[1:]
+    command = next((arg for arg in argv if not arg.startswith("-")), None)
+    if command in SUBPARSER_BUILDERS:
+        SUBPARSER_BUILDERS[command](subparsers)
+    else:
+        for build in SUBPARSER_BUILDERS.values():
+            build(subparsers)
+    
+    args = parser.parse_args(argv)
+    
+    # Handle no command
+    if args.command is None:
+        parser.print_help()
         return
+    
+    # shutil.copy2 already uses sendfile/copy_file_range on Linux; where it
+    # falls back to read/write (other platforms, some filesystems), copy
+    # images in 1 MiB chunks rather than the 64 KiB default
+    if args.command in ("add-artist", "add-style", "batch-add-artist", "batch-add-style"):
+        shutil.COPY_BUFSIZE = max(shutil.COPY_BUFSIZE, COPY_BUFSIZE)
+    
+    # Dispatch to the command handler
+    HANDLERS[args.command](args)
 
 
 if __name__ == "__main__":
+    # Add parent directory to path for imports, unless afcover is already
+    # importable (e.g. installed or run with python -m)
+    try:
+        import afcover
+    except ImportError:
+        sys.path.insert(0, str(Path(__file__).parent.parent))
+    
     main()
\ No newline at end of file
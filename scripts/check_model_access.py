@@ -7,10 +7,12 @@ This script tests basic auth against the model's endpoint.
 import sys
 import os
 import json
-import urllib.request
-import urllib.error
+import http.client
 from pathlib import Path
-from dotenv import load_dotenv
+
+# Host serving the model info endpoint
+FAL_HOST = "queue.fal.run"
+
 
 def check_model_access():
     """
@@ -20,7 +22,13 @@ def check_model_access():
         # Load the .env file
         dotenv_path = Path(__file__).parent.parent / ".env"
         if dotenv_path.exists():
-            load_dotenv(dotenv_path)
+            # Only FAL_KEY is needed, so scan for it rather than importing
+            # python-dotenv; like load_dotenv, an existing variable wins
+            if "FAL_KEY" not in os.environ:
+                for line in dotenv_path.read_text().splitlines():
+                    if line.startswith("FAL_KEY="):
+                        os.environ["FAL_KEY"] = line.split("=", 1)[1].strip().strip('"').strip("'")
+                        break
             print(f"Loaded environment from {dotenv_path}")
         
         # Get the API key
@@ -38,7 +46,7 @@ def check_model_access():
         print(f"API key loaded: {masked_key}")
         
         # Model endpoint
-        endpoint = "https://queue.fal.run/fal-ai/nano-banana-pro/info"
+        endpoint = "/fal-ai/nano-banana-pro/info"
         
         # Set up headers
         headers = {
@@ -48,37 +56,40 @@ def check_model_access():
         
         # Make a request to check model access
         print("Checking model access...")
-        req = urllib.request.Request(endpoint, headers=headers, method='GET')
-        
+        conn = http.client.HTTPSConnection(FAL_HOST, timeout=10)
         try:
-            with urllib.request.urlopen(req, timeout=10) as response:
-                print(f"✅ Successfully connected to model endpoint! Status code: {response.status}")
-                try:
-                    result = json.loads(response.read().decode('utf-8'))
-                    print(f"Model info: {json.dumps(result, indent=2)}")
-                except:
-                    # Response might not be JSON
-                    print("Response is not JSON format")
-                return True
-                
-        except urllib.error.HTTPError as e:
-            if e.code == 401:
-                print("❌ API key is invalid or lacks permission for this model (401 Unauthorized)")
-            elif e.code == 403:
-                print("❌ API key is valid but lacks permission for this model (403 Forbidden)")
-            elif e.code == 404:
-                print("❌ Model endpoint not found (404 Not Found)")
-            else:
-                print(f"❌ HTTP Error: {e.code} - {e.reason}")
+            try:
+                conn.request("GET", endpoint, headers=headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException) as e:
+                print(f"❌ Connection Error: {e}")
+                return False
             
-            error_body = e.read().decode('utf-8') if e.fp else ""
-            print(f"Error details: {error_body}")
-            return False
-            
-        except urllib.error.URLError as e:
-            print(f"❌ Connection Error: {e.reason}")
-            return False
+            if response.status >= 400:
+                if response.status == 401:
+                    print("❌ API key is invalid or lacks permission for this model (401 Unauthorized)")
+                elif response.status == 403:
+                    print("❌ API key is valid but lacks permission for this model (403 Forbidden)")
+                elif response.status == 404:
+                    print("❌ Model endpoint not found (404 Not Found)")
+                else:
+                    print(f"❌ HTTP Error: {response.status} - {response.reason}")
+                
+                error_body = response.read().decode('utf-8')
+                print(f"Error details: {error_body}")
+                return False
             
+            print(f"✅ Successfully connected to model endpoint! Status code: {response.status}")
+            try:
+                result = json.load(response)
+                print(f"Model info: {json.dumps(result, indent=2)}")
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                # Response might not be JSON
+                print("Response is not JSON format")
+            return True
+        finally:
+            conn.close()
+        
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
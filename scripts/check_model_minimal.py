@@ -7,10 +7,14 @@ Using the documented POST endpoint with minimal payload.
 import sys
 import os
 import json
-import urllib.request
-import urllib.error
 from pathlib import Path
 from dotenv import load_dotenv
+import requests
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 def check_minimal():
     """
@@ -48,23 +52,19 @@ def check_minimal():
         }
         
         # Set up headers
-        headers = {
-            "Authorization": f"Key {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        # Encode the payload
-        data = json.dumps(payload).encode('utf-8')
+        headers = {"Authorization": f"Key {api_key}"}
         
         # Make a request to check model access
         print("Testing model access with minimal payload...")
-        req = urllib.request.Request(endpoint, data=data, headers=headers, method='POST')
         
         try:
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read().decode('utf-8'))
+            with requests.post(endpoint, json=payload, headers=headers, timeout=10) as response:
+                response.raise_for_status()
+                # Print the body as sent and parse it once for the status fields
+                body = response.content
+                result = orjson.loads(body) if orjson else json.loads(body)
                 print(f"✅ Successfully submitted request to model!")
-                print(f"Response: {json.dumps(result, indent=2)}")
+                print(f"Response: {response.text}")
                 
                 if "status" in result and result["status"] == "IN_QUEUE":
                     print("✅ Request accepted and queued (this is good!)")
@@ -75,20 +75,20 @@ def check_minimal():
                     print("Response format is unexpected, but we got a 200 OK response")
                     return True
                 
-        except urllib.error.HTTPError as e:
-            if e.code == 401:
+        except requests.HTTPError as e:
+            status = e.response.status_code
+            if status == 401:
                 print("❌ API key is invalid (401 Unauthorized)")
-            elif e.code == 403:
+            elif status == 403:
                 print("❌ API key is valid but lacks permission (403 Forbidden)")
             else:
-                print(f"❌ HTTP Error: {e.code} - {e.reason}")
+                print(f"❌ HTTP Error: {status} - {e.response.reason}")
             
-            error_body = e.read().decode('utf-8') if e.fp else ""
-            print(f"Error details: {error_body}")
+            print(f"Error details: {e.response.text}")
             return False
             
-        except urllib.error.URLError as e:
-            print(f"❌ Connection Error: {e.reason}")
+        except requests.ConnectionError as e:
+            print(f"❌ Connection Error: {e}")
             return False
             
     except Exception as e:
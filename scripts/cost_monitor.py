@@ -8,7 +8,7 @@ and provides reporting on usage patterns.
 Usage:
   python cost_monitor.py report [--days=7]
   python cost_monitor.py limit [--set=5.00]
-  python cost_monitor.py reset
+  python cost_monitor.py reset [--yes]
 
 IMPORTANT: Always run this before using API features to check your spending.
 """
@@ -16,16 +16,28 @@ IMPORTANT: Always run this before using API features to check your spending.
 import os
 import sys
 import json
+import functools
 import argparse
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from shared.api import estimate_cost
+# The cost log (JSON lines) is appended to by shared.cost_control
+from shared.cost_control import (
+    COST_LOG_JSONL,
+    get_cost_summary,
+    iter_cost_entries,
+    migrate_cost_log,
+)
 
-# Cost log file
-COST_LOG_PATH = Path(__file__).parent.parent / "cost_log.json"
+# Cost limits file
 LIMITS_PATH = Path(__file__).parent.parent / "cost_limits.json"
 
 # Default limits
@@ -35,92 +47,98 @@ DEFAULT_LIMITS = {
     "monthly": 30.00 # $30.00 per month
 }
 
+# Set once initialize_cost_log has run, so each command checks the files once
+_INITED = False
+
+
+def _read_json(path):
+    """Parse a JSON file, using orjson when it is installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _write_json(path, obj):
+    """Write obj to a JSON file with 2-space indentation."""
+    if orjson:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+
 
 def initialize_cost_log():
     """Create or initialize the cost log file."""
-    if not COST_LOG_PATH.exists():
-        log = {
-            "entries": [],
-            "total_cost": 0.0,
-            "last_updated": datetime.now().isoformat(),
-            "created_at": datetime.now().isoformat()
-        }
-        with open(COST_LOG_PATH, 'w') as f:
-            json.dump(log, f, indent=2)
-        print(f"✅ Created new cost log at {COST_LOG_PATH}")
+    global _INITED
+    if _INITED:
+        return
+    _INITED = True
+    
+    migrate_cost_log()
+    if not COST_LOG_JSONL.exists():
+        COST_LOG_JSONL.touch()
+        print(f"✅ Created new cost log at {COST_LOG_JSONL}")
     
     if not LIMITS_PATH.exists():
-        with open(LIMITS_PATH, 'w') as f:
-            json.dump(DEFAULT_LIMITS, f, indent=2)
+        _write_json(LIMITS_PATH, DEFAULT_LIMITS)
         print(f"✅ Created default cost limits at {LIMITS_PATH}")
 
 
-def load_cost_log():
-    """Load the cost log, creating it if it doesn't exist."""
+def iter_entries():
+    """Yield cost log entries one at a time, reading the log line by line."""
     initialize_cost_log()
-    
-    try:
-        with open(COST_LOG_PATH, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"❌ Error loading cost log: {e}")
-        return {"entries": [], "total_cost": 0.0}
+    yield from iter_cost_entries()
 
 
+@functools.lru_cache(maxsize=1)
 def load_limits():
     """Load cost limits, creating defaults if they don't exist."""
     if not LIMITS_PATH.exists():
-        with open(LIMITS_PATH, 'w') as f:
-            json.dump(DEFAULT_LIMITS, f, indent=2)
+        _write_json(LIMITS_PATH, DEFAULT_LIMITS)
     
     try:
-        with open(LIMITS_PATH, 'r') as f:
-            return json.load(f)
+        return _read_json(LIMITS_PATH)
     except Exception:
-        return DEFAULT_LIMITS
+        return dict(DEFAULT_LIMITS)
 
 
 def save_limits(limits):
     """Save cost limits to file."""
-    with open(LIMITS_PATH, 'w') as f:
-        json.dump(limits, f, indent=2)
+    _write_json(LIMITS_PATH, limits)
+    load_limits.cache_clear()
 
 
 def generate_report(days=7):
     """Generate a cost report for the specified period."""
-    log = load_cost_log()
     limits = load_limits()
     
     # Calculate date range
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
+    start_ts = start_date.timestamp()
+    end_ts = end_date.timestamp()
     
-    # Filter entries by date
-    filtered_entries = []
-    for entry in log.get("entries", []):
+    # Filter entries by date and total them in a single pass over the log
+    total_cost = 0
+    num_entries = 0
+    by_operation = defaultdict(float)
+    by_date = defaultdict(float)
+    
+    for entry in iter_entries():
         try:
             entry_date = datetime.fromisoformat(entry["timestamp"])
-            if start_date <= entry_date <= end_date:
-                filtered_entries.append(entry)
         except (ValueError, KeyError):
             continue
-    
-    # Calculate totals
-    total_cost = sum(entry.get("cost", 0) for entry in filtered_entries)
-    by_operation = {}
-    by_date = {}
-    
-    for entry in filtered_entries:
-        # By operation
-        op = entry.get("operation", "unknown")
-        by_operation[op] = by_operation.get(op, 0) + entry.get("cost", 0)
-        
-        # By date
-        try:
-            date_str = datetime.fromisoformat(entry["timestamp"]).date().isoformat()
-            by_date[date_str] = by_date.get(date_str, 0) + entry.get("cost", 0)
-        except (ValueError, KeyError):
+        # Compare epoch seconds, which also works for timezone-aware timestamps
+        if not start_ts <= entry_date.timestamp() <= end_ts:
             continue
+        
+        cost = entry.get("cost", 0)
+        total_cost += cost
+        num_entries += 1
+        by_operation[entry.get("operation", "unknown")] += cost
+        by_date[entry_date.date().isoformat()] += cost
     
     # Calculate daily average
     daily_avg = total_cost / days if days > 0 else 0
@@ -128,6 +146,7 @@ def generate_report(days=7):
     # Calculate today's spend
     today = datetime.now().date().isoformat()
     today_spend = by_date.get(today, 0)
+    daily_limit = limits.get('daily', DEFAULT_LIMITS['daily'])
     
     # Format the report
     report = [
@@ -137,11 +156,11 @@ def generate_report(days=7):
         f"📅 Period: {start_date.date()} to {end_date.date()}",
         f"💰 Total cost: ${total_cost:.2f}",
         f"📈 Daily average: ${daily_avg:.2f}",
-        f"🔄 Operations: {len(filtered_entries)}",
+        f"🔄 Operations: {num_entries}",
         f"",
         f"⚠️ Limits:",
-        f"  Daily limit: ${limits.get('daily', DEFAULT_LIMITS['daily']):.2f}",
-        f"  Today's usage: ${today_spend:.2f} ({today_spend/limits.get('daily', DEFAULT_LIMITS['daily'])*100:.1f}% of limit)",
+        f"  Daily limit: ${daily_limit:.2f}",
+        f"  Today's usage: ${today_spend:.2f} ({today_spend/daily_limit*100:.1f}% of limit)",
         f"",
     ]
     
@@ -163,6 +182,9 @@ def generate_report(days=7):
 
 def estimate_image_cost():
     """Calculate cost for different image generation scenarios."""
+    # Imported here so commands without estimates skip loading shared.api
+    from shared.api import estimate_cost
+    
     scenarios = [
         {"desc": "Single draft image (1K)", "images": 1, "res": "1K"},
         {"desc": "Single high-res image (4K)", "images": 1, "res": "4K"},
@@ -184,67 +206,76 @@ def estimate_image_cost():
 
 def set_limit(limit_type, value):
     """Set a spending limit."""
-    if limit_type not in ["daily", "session", "monthly"]:
-        print(f"❌ Invalid limit type: {limit_type}")
-        return
+    set_limits({limit_type: value})
+
+
+def set_limits(changes):
+    """
+    Set several spending limits, writing the limits file at most once.
     
-    try:
-        value = float(value)
+    Args:
+        changes: Mapping of limit type to new value
+    """
+    limits = dict(load_limits())
+    changed = False
+    
+    for limit_type, value in changes.items():
+        if limit_type not in ["daily", "session", "monthly"]:
+            print(f"❌ Invalid limit type: {limit_type}")
+            continue
+        
+        try:
+            value = float(value)
+        except ValueError:
+            print("❌ Invalid limit value. Must be a number.")
+            continue
         if value <= 0:
             print("❌ Limit must be greater than zero")
-            return
-            
-        limits = load_limits()
+            continue
+        
         old_value = limits.get(limit_type, DEFAULT_LIMITS[limit_type])
-        limits[limit_type] = value
-        save_limits(limits)
+        if limits.get(limit_type) != value:
+            limits[limit_type] = value
+            changed = True
         
         print(f"✅ {limit_type.capitalize()} limit updated: ${old_value:.2f} → ${value:.2f}")
-        
-    except ValueError:
-        print("❌ Invalid limit value. Must be a number.")
+    
+    if changed:
+        save_limits(limits)
 
 
-def reset_cost_log():
-    """Reset the cost log (with confirmation)."""
-    if not COST_LOG_PATH.exists():
-        print("No cost log exists yet.")
-        return
+def reset_cost_log(assume_yes=False):
+    """
+    Reset the cost log (with confirmation).
     
-    confirm = input("⚠️ This will delete ALL cost history. Continue? (yes/no): ")
-    if confirm.lower() != "yes":
-        print("Operation cancelled.")
+    Args:
+        assume_yes: Skip the confirmation prompt, for use from scripts
+    """
+    migrate_cost_log()
+    if not COST_LOG_JSONL.exists():
+        print("No cost log exists yet.")
         return
     
-    log = load_cost_log()
-    total = log.get("total_cost", 0)
-    entries = len(log.get("entries", []))
-    
-    # Create backup
-    backup_path = COST_LOG_PATH.with_suffix(".backup.json")
-    with open(backup_path, 'w') as f:
-        json.dump(log, f, indent=2)
+    if not assume_yes:
+        confirm = input("⚠️ This will delete ALL cost history. Continue? (yes/no): ")
+        if confirm.lower() != "yes":
+            print("Operation cancelled.")
+            return
     
-    # Reset log
-    new_log = {
-        "entries": [],
-        "total_cost": 0.0,
-        "last_updated": datetime.now().isoformat(),
-        "created_at": datetime.now().isoformat(),
-        "reset_from": {
-            "timestamp": datetime.now().isoformat(),
-            "previous_total": total,
-            "previous_entries": entries
-        }
-    }
+    summary = get_cost_summary()
+    total = summary["total_cost"]
+    entries = summary["entries"]
     
-    with open(COST_LOG_PATH, 'w') as f:
-        json.dump(new_log, f, indent=2)
+    # Move the log aside as the backup and start a new, empty one
+    backup_path = COST_LOG_JSONL.with_suffix(".backup.jsonl")
+    os.replace(COST_LOG_JSONL, backup_path)
+    COST_LOG_JSONL.touch()
     
     print(f"✅ Cost log reset. Previous data (${ total:.2f}, {entries} entries) backed up to {backup_path}")
 
 
-def main():
+def _build_parser():
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         description="Monitor and manage NanoBot API costs",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -254,6 +285,7 @@ Examples:
   python cost_monitor.py report --days=30
   python cost_monitor.py limit --daily=10
   python cost_monitor.py reset
+  python cost_monitor.py reset --yes
         """
     )
     
@@ -271,26 +303,29 @@ Examples:
     limit_parser.add_argument("--monthly", type=float, help="Set monthly limit")
     
     # Reset command
-    subparsers.add_parser("reset", help="Reset cost log (with backup)")
+    reset_parser = subparsers.add_parser("reset", help="Reset cost log (with backup)")
+    reset_parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
     
     # Initialize command
     subparsers.add_parser("init", help="Initialize cost tracking files")
     
+    return parser
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
     
-    # Initialize cost log if needed
-    initialize_cost_log()
-    
+    # Commands that read the cost log initialize it on first use
     if args.command == "report":
         print(generate_report(args.days))
         print("\n" + estimate_image_cost())
     elif args.command == "limit":
-        if args.daily is not None:
-            set_limit("daily", args.daily)
-        if args.session is not None:
-            set_limit("session", args.session)
-        if args.monthly is not None:
-            set_limit("monthly", args.monthly)
+        # Apply every flag given with one write of the limits file
+        requested = {"daily": args.daily, "session": args.session, "monthly": args.monthly}
+        changes = {k: v for k, v in requested.items() if v is not None}
+        if changes:
+            set_limits(changes)
         
         # Show current limits if no specific limit was set
         if args.daily is None and args.session is None and args.monthly is None:
@@ -299,7 +334,7 @@ Examples:
             for limit_type, value in limits.items():
                 print(f"  {limit_type.capitalize()}: ${value:.2f}")
     elif args.command == "reset":
-        reset_cost_log()
+        reset_cost_log(assume_yes=args.yes)
     elif args.command == "init":
         initialize_cost_log()
         print("✅ Cost tracking initialized.")
@@ -3,39 +3,50 @@
 Create a simple test image to use as reference for API testing.
 """
 
-import os
+import sys
 from pathlib import Path
 
-try:
-    # Try to import PIL for image creation
+# Image size and circle geometry
+WIDTH = HEIGHT = 400
+CIRCLE_X = 200
+CIRCLE_Y = 200
+CIRCLE_RADIUS = 100
+
+BACKGROUND = (0, 100, 200)
+CIRCLE_COLOR = (255, 255, 255)
+
+
+def create_image():
+    """Build the test image: a blue square with a white circle."""
     from PIL import Image, ImageDraw
     
-    # Create output directory
-    output_dir = Path(__file__).parent.parent / "test_output"
-    output_dir.mkdir(exist_ok=True)
-    
-    # Create a blue 400x400 image with a white circle
-    img = Image.new('RGB', (400, 400), color=(0, 100, 200))
+    img = Image.new('RGB', (WIDTH, HEIGHT), color=BACKGROUND)
     draw = ImageDraw.Draw(img)
-    
-    # Draw a white circle
-    circle_x = 200
-    circle_y = 200
-    circle_radius = 100
     draw.ellipse(
-        (circle_x - circle_radius, circle_y - circle_radius, 
-         circle_x + circle_radius, circle_y + circle_radius), 
-        fill=(255, 255, 255)
+        (CIRCLE_X - CIRCLE_RADIUS, CIRCLE_Y - CIRCLE_RADIUS,
+         CIRCLE_X + CIRCLE_RADIUS, CIRCLE_Y + CIRCLE_RADIUS),
+        fill=CIRCLE_COLOR
     )
+    return img
+
+
+def main():
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("PIL/Pillow is not installed. Install it with: pip install pillow", file=sys.stderr)
+        sys.exit(1)
+    
+    # Create output directory
+    output_dir = Path(__file__).parent.parent / "test_output"
+    output_dir.mkdir(exist_ok=True)
     
-    # Save the image
+    # Save the image; it is a flat-color fixture, so light compression is enough
     output_path = output_dir / "reference_test_image.png"
-    img.save(output_path)
+    create_image().save(output_path, optimize=False, compress_level=1)
     
     print(f"Created test image: {output_path}")
-except ImportError:
-    print("PIL/Pillow is not installed. Installing...")
-    import subprocess
-    import sys
-    subprocess.call([sys.executable, "-m", "pip", "install", "pillow"])
-    print("Please run this script again after installation.")
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    main()
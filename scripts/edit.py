@@ -8,31 +8,88 @@ import argparse
 import json
 import os
 import sys
-import urllib.request
-import urllib.error
+import shutil
 import base64
+import functools
 import mimetypes
+import mmap
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 FAL_API_URL = "https://queue.fal.run/fal-ai/nano-banana-pro/edit"
 
+# Bytes buffered per read while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Keep-alive session shared by the API call and every download, so each host
+# pays the TLS handshake once. Retry covers connection failures and, for the
+# idempotent downloads, transient 429/5xx; the edit POST is never resent
+# after the server has answered.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
+
+@functools.lru_cache(maxsize=64)
+def _content_type(ext):
+    """Return the image content type for a file extension (without the dot)."""
+    if not mimetypes.inited:
+        mimetypes.init()
+    file_type = mimetypes.types_map.get("." + ext.lower())
+    if file_type and file_type.startswith("image/"):
+        return file_type
+    return f"image/{ext}"
+
+
 def upload_image(image_path):
-    """Upload image to fal.ai storage service."""
+    """Encode a local image as a data URI, returned as ASCII bytes."""
     # This is a simplified approach - in a more robust implementation,
     # we would use the fal_client library for uploads
     with open(image_path, "rb") as f:
-        file_data = f.read()
-    
-    file_type = mimetypes.guess_type(image_path)[0] or "application/octet-stream"
-    file_ext = os.path.splitext(image_path)[1].lstrip(".")
-    if not file_type.startswith("image/"):
-        file_type = f"image/{file_ext}"
-    
-    # Convert to data URI - easier than separate upload for this script
-    data_uri = f"data:{file_type};base64,{base64.b64encode(file_data).decode('utf-8')}"
-    return data_uri
+        # Encode straight from the page cache; mmap refuses empty files
+        # and some filesystems, where a plain read is used instead
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoded = base64.b64encode(mm)
+        except (ValueError, OSError):
+            encoded = base64.b64encode(f.read())
+    
+    file_type = _content_type(os.path.splitext(image_path)[1].lstrip("."))
+    
+    # Convert to data URI - easier than separate upload for this script.
+    # Kept as bytes so it can be spliced into the request body without
+    # decoding to str and re-encoding
+    return b"data:" + file_type.encode("ascii") + b";base64," + encoded
+
+
+def build_request_body(payload, image_urls):
+    """
+    Serialize payload plus image_urls as a JSON request body.
+    
+    URLs given as str are JSON-encoded normally; data URIs given as bytes
+    are base64 text that needs no escaping, so they are copied straight
+    into the body. Each encoded image is copied once, by the final join.
+    """
+    head = json.dumps(payload)[:-1].encode("utf-8")
+    pieces = [head, b', "image_urls": [']
+    for i, url in enumerate(image_urls):
+        if i:
+            pieces.append(b", ")
+        if isinstance(url, bytes):
+            pieces += (b'"', url, b'"')
+        else:
+            pieces.append(json.dumps(url).encode("utf-8"))
+    pieces.append(b"]}")
+    return b"".join(pieces)
+
 
 def edit_image(prompt, image_paths, api_key, resolution="1K", aspect_ratio="auto", num_images=1):
     """Call fal.ai Nano Banana Pro Edit API."""
@@ -48,7 +105,6 @@ def edit_image(prompt, image_paths, api_key, resolution="1K", aspect_ratio="auto
     
     payload = {
         "prompt": prompt,
-        "image_urls": image_urls,
         "aspect_ratio": aspect_ratio,
         "resolution": resolution,
         "num_images": num_images,
@@ -59,29 +115,28 @@ def edit_image(prompt, image_paths, api_key, resolution="1K", aspect_ratio="auto
         "Authorization": f"Key {api_key}",
         "Content-Type": "application/json"
     }
-    
-    data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(FAL_API_URL, data=data, headers=headers, method='POST')
+    body = build_request_body(payload, image_urls)
+    del image_urls
     
     try:
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8') if e.fp else str(e)
-        print(f"API Error {e.code}: {error_body}", file=sys.stderr)
+        response = SESSION.post(FAL_API_URL, data=body, headers=headers, timeout=120)
+        response.raise_for_status()
+        return response.json()
+    except requests.HTTPError as e:
+        print(f"API Error {e.response.status_code}: {e.response.text}", file=sys.stderr)
         sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"Connection Error: {e.reason}", file=sys.stderr)
+    except requests.RequestException as e:
+        print(f"Connection Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
 def download_image(url, output_path):
-    """Download generated image to local path."""
-    req = urllib.request.Request(url)
-    with urllib.request.urlopen(req, timeout=60) as response:
+    """Download generated image to local path, streaming it to disk."""
+    with SESSION.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
         with open(output_path, 'wb') as f:
-            f.write(response.read())
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
     return output_path
 
 
@@ -147,25 +202,27 @@ Examples:
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Download images
+    # Generate filenames up front so parallel downloads never share one
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base_name = Path(args.images[0]).stem if args.images else "edit"
+    
+    def compute_path(i):
+        if args.output and len(images) == 1:
+            return Path(args.output)
+        return output_dir / f"{base_name}-edited-{timestamp}-{i+1}.png"
+    
+    # Download images concurrently over the pooled session
+    jobs = [(img["url"], compute_path(i)) for i, img in enumerate(images) if img.get("url")]
     downloaded = []
-    for i, img in enumerate(images):
-        url = img.get("url")
-        if url:
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            
-            if args.output and len(images) == 1:
-                out_path = args.output
-            else:
-                base_name = Path(args.images[0]).stem if args.images else "edit"
-                out_path = output_dir / f"{base_name}-edited-{timestamp}-{i+1}.png"
-            
-            download_image(url, out_path)
-            downloaded.append(str(out_path.absolute()))
-            
-            if not args.json:
-                print(f"✅ Saved: {out_path}")
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(4, len(jobs))) as executor:
+            futures = [executor.submit(download_image, url, out_path) for url, out_path in jobs]
+            for future in futures:
+                out_path = future.result()
+                downloaded.append(str(out_path.absolute()))
+                
+                if not args.json:
+                    print(f"✅ Saved: {out_path}")
     
     # Calculate cost
     cost = 0.15 * len(downloaded)
@@ -5,17 +5,73 @@ Usage: python generate.py --title "Album Name" --artist "Artist" --genre "synthw
 """
 
 import argparse
+import hashlib
 import json
 import os
+import re
 import sys
-import urllib.request
-import urllib.error
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 FAL_API_URL = "https://queue.fal.run/fal-ai/nano-banana-pro"
 
+# Bytes buffered per read while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Fixed opening and closing sentences of every prompt
+_PROMPT_PREFIX = "Professional album cover art, square format, print-ready quality, centered composition."
+_PROMPT_SUFFIX = "High resolution, no watermarks, professional album cover composition, suitable for streaming platforms and print."
+
+# Sentence added for each optional argument that is set; the title wording
+# matters for text rendering
+_PROMPT_FIELDS = (
+    ("style", "Visual direction: {}."),
+    ("title", 'Album title "{}" prominently displayed with clear, legible typography.'),
+    ("artist", 'Artist name "{}" integrated into the design.'),
+    ("colors", "Color palette: {}."),
+    ("logo", "Include logo element: {}."),
+    ("subject", "Main visual subject: {}."),
+)
+
+# fal.ai returns at most this many images per submission
+MAX_IMAGES_PER_REQUEST = 4
+
+# Price per generated image by resolution (4K costs 2x)
+COST_PER_IMAGE = {"1K": 0.15, "2K": 0.15, "4K": 0.30}
+
+# Characters dropped from titles when building filenames: anything but
+# letters, digits, spaces and hyphens
+_UNSAFE_TITLE_CHARS = re.compile(r"[^\w -]|_")
+
+# Covers from earlier runs, keyed by a hash of the request
+CACHE_DIR = Path.home() / ".cache" / "nanobot"
+
+# Keep revalidatable copies of downloads under CACHE_DIR/downloads. Off by
+# default: fal result URLs are unique per generation, so it rarely pays off
+DOWNLOAD_CACHE = os.environ.get("NANOBOT_DOWNLOAD_CACHE") == "1"
+
+# Keep-alive session shared by the API call and every download, so each host
+# pays the TLS handshake once. Retry covers connection failures and, for the
+# idempotent downloads, transient 429/5xx; the generate POST is never resent
+# after the server has answered.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
 GENRE_STYLES = {
     "synthwave": "synthwave aesthetic, neon lights, retro-futuristic, purple and cyan color palette, 80s vibes, chrome text, sunset gradient background",
     "hip-hop": "urban aesthetic, bold typography, street art influence, high contrast, gold accents, graffiti elements",
@@ -38,46 +94,30 @@ GENRE_STYLES = {
 
 def build_prompt(args):
     """Compose the generation prompt from parameters."""
-    
-    prompt_parts = [
-        "Professional album cover art, square format, print-ready quality, centered composition.",
-    ]
+    prompt_parts = [_PROMPT_PREFIX]
     
     # Genre styling
     if args.genre:
         style = GENRE_STYLES.get(args.genre.lower(), args.genre)
         prompt_parts.append(f"Style: {style}.")
     
-    # Custom style override
-    if args.style:
-        prompt_parts.append(f"Visual direction: {args.style}.")
-    
-    # Title - important for text rendering
-    if args.title:
-        prompt_parts.append(f'Album title "{args.title}" prominently displayed with clear, legible typography.')
-    
-    # Artist
-    if args.artist:
-        prompt_parts.append(f'Artist name "{args.artist}" integrated into the design.')
-    
-    # Colors
-    if args.colors:
-        prompt_parts.append(f"Color palette: {args.colors}.")
-    
-    # Logo
-    if args.logo:
-        prompt_parts.append(f"Include logo element: {args.logo}.")
-    
-    # Subject/imagery
-    if args.subject:
-        prompt_parts.append(f"Main visual subject: {args.subject}.")
+    # Optional fields, in prompt order (style, title, artist, colors, logo, subject)
+    for field, template in _PROMPT_FIELDS:
+        value = getattr(args, field)
+        if value:
+            prompt_parts.append(template.format(value))
     
     # Quality markers
-    prompt_parts.append("High resolution, no watermarks, professional album cover composition, suitable for streaming platforms and print.")
+    prompt_parts.append(_PROMPT_SUFFIX)
     
     return " ".join(prompt_parts)
 
 
+def estimate_cost(num_images=1, resolution="1K"):
+    """Estimated cost in USD of num_images covers at the given resolution."""
+    return COST_PER_IMAGE[resolution] * num_images
+
+
 def generate_cover(prompt, api_key, resolution="1K", num_images=1):
     """Call fal.ai Nano Banana Pro API."""
     
@@ -94,31 +134,251 @@ def generate_cover(prompt, api_key, resolution="1K", num_images=1):
         "Content-Type": "application/json"
     }
     
-    data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(FAL_API_URL, data=data, headers=headers, method='POST')
-    
     try:
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8') if e.fp else str(e)
-        print(f"API Error {e.code}: {error_body}", file=sys.stderr)
-        sys.exit(1)
-    except urllib.error.URLError as e:
-        print(f"Connection Error: {e.reason}", file=sys.stderr)
+        response = SESSION.post(FAL_API_URL, json=payload, headers=headers, timeout=120, stream=True)
+        with response:
+            if response.status_code >= 400:
+                # Read the error detail before the streamed response closes
+                print(f"API Error {response.status_code}: {response.text}", file=sys.stderr)
+                sys.exit(1)
+            if ijson is None:
+                return response.json()
+            
+            # Only the image entries are used; stream them out of the body
+            # instead of building the whole response
+            response.raw.decode_content = True
+            try:
+                return {"images": list(ijson.items(response.raw, "images.item", use_float=True))}
+            except ijson.JSONError as e:
+                print(f"Invalid API response: {e}", file=sys.stderr)
+                sys.exit(1)
+    except requests.RequestException as e:
+        print(f"Connection Error: {e}", file=sys.stderr)
         sys.exit(1)
 
 
 def download_image(url, output_path):
-    """Download generated image to local path."""
-    req = urllib.request.Request(url)
-    with urllib.request.urlopen(req, timeout=60) as response:
+    """
+    Download generated image to local path, streaming it to disk.
+    
+    With DOWNLOAD_CACHE enabled (NANOBOT_DOWNLOAD_CACHE=1), images served
+    with an ETag or Last-Modified header are also kept under
+    CACHE_DIR/downloads. Fetching the same URL again sends those
+    validators, and a 304 Not Modified reuses the kept copy.
+    """
+    if not DOWNLOAD_CACHE:
+        with SESSION.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(output_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        return output_path
+    
+    download_dir = CACHE_DIR / "downloads"
+    name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    cached_path = download_dir / f"{name}.png"
+    meta_path = download_dir / f"{name}.json"
+    
+    headers = {}
+    try:
+        with open(meta_path, 'r') as f:
+            known = json.load(f)
+        if cached_path.exists():
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+    except (OSError, ValueError, AttributeError):
+        pass
+    
+    with SESSION.get(url, headers=headers, stream=True, timeout=60) as response:
+        if response.status_code == 304 and headers:
+            shutil.copyfile(cached_path, output_path)
+            return output_path
+        
+        response.raise_for_status()
+        response.raw.decode_content = True
         with open(output_path, 'wb') as f:
-            f.write(response.read())
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+    
+    if validators["etag"] or validators["last_modified"]:
+        try:
+            download_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(output_path, cached_path)
+            with open(meta_path, 'w') as f:
+                json.dump(validators, f)
+        except OSError as e:
+            print(f"Warning: could not cache download: {e}", file=sys.stderr)
     return output_path
 
 
+def generate_batch(prompts, api_key, resolution="1K", num_images=1, max_workers=4):
+    """
+    Generate covers for several prompts concurrently.
+    
+    Repeated prompts are merged: their images are requested together,
+    up to MAX_IMAGES_PER_REQUEST per submission, and split back afterwards.
+    
+    Yields (index, prompt, result) as each prompt's covers are ready, so
+    callers can download the first covers while slower requests are still
+    running. result holds that prompt's "images".
+    """
+    # One slot per requested image, grouped by prompt text
+    slots_by_prompt = {}
+    for i, prompt in enumerate(prompts):
+        slots_by_prompt.setdefault(prompt, []).extend([i] * num_images)
+    
+    jobs = []
+    for prompt, slots in slots_by_prompt.items():
+        for start in range(0, len(slots), MAX_IMAGES_PER_REQUEST):
+            jobs.append((prompt, slots[start:start + MAX_IMAGES_PER_REQUEST]))
+    
+    images = {i: [] for i in range(len(prompts))}
+    remaining = {i: num_images for i in range(len(prompts))}
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as executor:
+        futures = {
+            executor.submit(generate_cover, prompt, api_key, resolution, len(slots)): slots
+            for prompt, slots in jobs
+        }
+        for future in as_completed(futures):
+            slots = futures[future]
+            returned = future.result().get("images", [])
+            for k, i in enumerate(slots):
+                if k < len(returned):
+                    images[i].append(returned[k])
+                remaining[i] -= 1
+                if not remaining[i]:
+                    yield i, prompts[i], {"images": images.pop(i)}
+
+
+def title_slug(title):
+    """Filename-safe, lowercase form of an album title (max 30 chars)."""
+    return _UNSAFE_TITLE_CHARS.sub("", title).replace(" ", "-").lower()[:30]
+
+
+def load_api_key():
+    """Load FAL_KEY from the environment or .env file, exiting if missing."""
+    # Load environment variables from .env file (imported here so
+    # --prompt-only and --help don't pay for python-dotenv)
+    from dotenv import load_dotenv
+    env_file = Path(__file__).parent.parent / '.env'
+    load_dotenv(env_file)
+    
+    # Get API key
+    api_key = os.environ.get("FAL_KEY")
+    if not api_key:
+        print("Error: FAL_KEY not found", file=sys.stderr)
+        print("Please create a .env file with your API key (see .env.example)", file=sys.stderr)
+        print("Get your key at: https://fal.ai/dashboard/keys", file=sys.stderr)
+        sys.exit(1)
+    return api_key
+
+
+def write_json(data):
+    """Write data to stdout as indented JSON without building the string first."""
+    json.dump(data, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+def prepare_output_dir(path):
+    """Create the output directory and check it is writable, exiting if not."""
+    output_dir = Path(path)
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryFile(dir=output_dir):
+            pass
+    except OSError as e:
+        print(f"Error: Cannot write to output directory {output_dir}: {e}", file=sys.stderr)
+        sys.exit(1)
+    return output_dir
+
+
+def run_batch(args, api_key):
+    """Generate one set of covers per line of --prompts-file."""
+    with open(args.prompts_file, 'r', encoding='utf-8') as f:
+        prompts = [line.strip() for line in f if line.strip()]
+    if not prompts:
+        print("Error: No prompts found in --prompts-file", file=sys.stderr)
+        sys.exit(1)
+    
+    if not args.json:
+        print(f"🎨 Generating cover art for {len(prompts)} prompt(s)...", file=sys.stderr)
+    
+    output_dir = prepare_output_dir(args.output_dir)
+    safe_title = title_slug(args.title)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    
+    # Download each prompt's covers as soon as its request completes
+    batches = [None] * len(prompts)
+    for n, prompt, result in generate_batch(prompts, api_key, args.resolution, args.num):
+        urls = [img["url"] for img in result.get("images", []) if img.get("url")]
+        downloaded = []
+        for i, url in enumerate(urls):
+            suffix = f"-{i+1}" if len(urls) > 1 else ""
+            out_path = output_dir / f"cover-{safe_title}-{timestamp}-p{n+1}{suffix}.png"
+            download_image(url, out_path)
+            downloaded.append(str(out_path.absolute()))
+            
+            if not args.json:
+                print(f"✅ Saved: {out_path}")
+        batches[n] = {"prompt": prompt, "images": downloaded, "count": len(downloaded)}
+    
+    # Calculate cost
+    count = sum(batch["count"] for batch in batches)
+    cost = estimate_cost(count, args.resolution)
+    
+    if args.json:
+        write_json({
+            "title": args.title,
+            "artist": args.artist,
+            "resolution": args.resolution,
+            "batches": batches,
+            "count": count,
+            "cost": f"${cost:.2f}"
+        })
+    else:
+        print(f"\n🎵 Generated {count} cover(s) from {len(prompts)} prompt(s)")
+        print(f"💰 Estimated cost: ${cost:.2f}")
+
+
+def cache_key(prompt, resolution, num_images):
+    """Key identifying a generation request in the local cover cache."""
+    return hashlib.sha256(f"{prompt}|{resolution}|{num_images}".encode("utf-8")).hexdigest()
+
+
+def load_cached_covers(key):
+    """Return the cached cover paths for key, or None if any are missing."""
+    try:
+        with open(CACHE_DIR / f"{key}.json", 'r') as f:
+            paths = json.load(f)["images"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    
+    if not paths or not all(os.path.isfile(p) for p in paths):
+        return None
+    return paths
+
+
+def store_cached_covers(key, image_paths):
+    """Copy downloaded covers into the cache and record them under key."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cached = []
+        for i, path in enumerate(image_paths, 1):
+            target = CACHE_DIR / f"{key}-{i}.png"
+            shutil.copyfile(path, target)
+            cached.append(str(target))
+        with open(CACHE_DIR / f"{key}.json", 'w') as f:
+            json.dump({"images": cached}, f)
+    except OSError as e:
+        print(f"Warning: could not cache covers: {e}", file=sys.stderr)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate album cover art using Nano Banana Pro",
@@ -145,6 +405,10 @@ Examples:
     parser.add_argument("--num", type=int, default=1, help="Number of variations (1-4)")
     parser.add_argument("--prompt-only", action="store_true", help="Only output the prompt, don't generate")
     parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    parser.add_argument("--prompts-file",
+                        help="Generate from each prompt in this file (one per line) concurrently")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Call the API even if this prompt was generated before")
     
     args = parser.parse_args()
     
@@ -160,61 +424,68 @@ Examples:
         print(prompt)
         return
     
-    # Load environment variables from .env file
-    env_file = Path(__file__).parent.parent / '.env'
-    load_dotenv(env_file)
+    if args.prompts_file:
+        run_batch(args, load_api_key())
+        return
     
-    # Get API key
-    api_key = os.environ.get("FAL_KEY")
-    if not api_key:
-        print("Error: FAL_KEY not found", file=sys.stderr)
-        print("Please create a .env file with your API key (see .env.example)", file=sys.stderr)
-        print("Get your key at: https://fal.ai/dashboard/keys", file=sys.stderr)
-        sys.exit(1)
+    # Prepare output directory before paying for the API call
+    output_dir = prepare_output_dir(args.output_dir)
     
-    if not args.json:
-        print(f"🎨 Generating cover art for '{args.title}' by {args.artist}...", file=sys.stderr)
-        print(f"📝 Prompt: {prompt[:100]}...", file=sys.stderr)
+    # Reuse covers from an identical earlier request instead of paying again
+    key = cache_key(prompt, args.resolution, args.num)
+    cached = None if args.no_cache else load_cached_covers(key)
     
-    # Generate
-    result = generate_cover(prompt, api_key, args.resolution, args.num)
+    if cached is None:
+        api_key = load_api_key()
+        
+        if not args.json:
+            print(f"🎨 Generating cover art for '{args.title}' by {args.artist}...", file=sys.stderr)
+            print(f"📝 Prompt: {prompt[:100]}...", file=sys.stderr)
+        
+        # Generate
+        result = generate_cover(prompt, api_key, args.resolution, args.num)
+        
+        # Handle output
+        images = result.get("images", [])
+        if not images:
+            print("Error: No images returned from API", file=sys.stderr)
+            sys.exit(1)
+    else:
+        images = cached
+        if not args.json:
+            print(f"♻️ Reusing {len(cached)} cached cover(s) for this prompt", file=sys.stderr)
     
-    # Handle output
-    images = result.get("images", [])
-    if not images:
-        print("Error: No images returned from API", file=sys.stderr)
-        sys.exit(1)
+    # Generate filenames up front so parallel downloads never share one
+    safe_title = title_slug(args.title)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     
-    # Prepare output directory
-    output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    def compute_path(i):
+        if args.output and len(images) == 1:
+            return Path(args.output)
+        suffix = f"-{i+1}" if len(images) > 1 else ""
+        return output_dir / f"cover-{safe_title}-{timestamp}{suffix}.png"
     
-    # Download images
+    # Download images (or copy cached ones) concurrently
+    if cached is None:
+        jobs = [(download_image, img["url"], compute_path(i)) for i, img in enumerate(images) if img.get("url")]
+    else:
+        jobs = [(shutil.copyfile, path, compute_path(i)) for i, path in enumerate(cached)]
     downloaded = []
-    for i, img in enumerate(images):
-        url = img.get("url")
-        if url:
-            # Generate safe filename
-            safe_title = "".join(c if c.isalnum() or c in "- " else "" for c in args.title)
-            safe_title = safe_title.replace(" ", "-").lower()[:30]
-            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-            
-            if args.output and len(images) == 1:
-                out_path = Path(args.output)
-            else:
-                suffix = f"-{i+1}" if len(images) > 1 else ""
-                out_path = output_dir / f"cover-{safe_title}-{timestamp}{suffix}.png"
-            
-            download_image(url, out_path)
-            downloaded.append(str(out_path.absolute()))
-            
-            if not args.json:
-                print(f"✅ Saved: {out_path}")
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(4, len(jobs))) as executor:
+            futures = [executor.submit(fetch, src, out_path) for fetch, src, out_path in jobs]
+            for future in futures:
+                out_path = future.result()
+                downloaded.append(str(out_path.absolute()))
+                
+                if not args.json:
+                    print(f"✅ Saved: {out_path}")
     
-    # Calculate cost
-    cost = 0.15 * len(downloaded)
-    if args.resolution == "4K":
-        cost *= 2
+    if cached is None and downloaded:
+        store_cached_covers(key, downloaded)
+    
+    # Calculate cost (nothing is charged for cached covers)
+    cost = estimate_cost(len(downloaded), args.resolution) if cached is None else 0.0
     
     # Output summary
     output_data = {
@@ -229,7 +500,7 @@ Examples:
     }
     
     if args.json:
-        print(json.dumps(output_data, indent=2))
+        write_json(output_data)
     else:
         print(f"\n🎵 Generated {len(downloaded)} cover(s) for '{args.title}'")
         print(f"💰 Estimated cost: ${cost:.2f}")
@@ -7,18 +7,30 @@ import sys
 import os
 import json
 import time
-import urllib.request
-import urllib.error
+import random
 from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def load_api_key():
-    """Load API key from .env file."""
-    env_path = Path(__file__).parent.parent / ".env"
-    with open(env_path, 'r') as f:
-        for line in f:
-            if line.startswith('FAL_KEY='):
-                return line.strip().split('=', 1)[1]
-    raise ValueError("FAL_KEY not found in .env file")
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.api import load_api_key
+
+# Poll delays: start short so quick jobs are seen quickly, then back off
+POLL_INITIAL_DELAY = 0.5
+POLL_BACKOFF = 1.7
+POLL_MAX_DELAY = 5.0
+POLL_ATTEMPTS = 30
+
+# One keep-alive session for the submit, every status poll and the result
+# fetch, so the TLS handshake is paid once
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=2,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
 
 def main():
     try:
@@ -47,17 +59,15 @@ def main():
             "Content-Type": "application/json"
         }
         
-        # Encode the payload
-        data = json.dumps(payload).encode('utf-8')
-        
         # Make the request
         print("Sending API request...")
-        req = urllib.request.Request(endpoint, data=data, headers=headers, method='POST')
-        
-        with urllib.request.urlopen(req, timeout=20) as response:
-            initial_response = json.loads(response.read().decode('utf-8'))
+        response = SESSION.post(endpoint, json=payload, headers=headers, timeout=20)
+        response.raise_for_status()
+        initial_response = response.json()
             
-        print(f"Initial response: {json.dumps(initial_response, indent=2)}")
+        sys.stdout.write("Initial response: ")
+        json.dump(initial_response, sys.stdout, indent=2)
+        sys.stdout.write("\n")
         
         # Check if queued
         if "status" in initial_response and initial_response["status"] == "IN_QUEUE":
@@ -68,13 +78,13 @@ def main():
             if not status_url:
                 raise ValueError("Status URL not found in response")
                 
-            # Poll up to 20 times, waiting 5 seconds between each attempt
-            for i in range(20):
+            # Poll with exponential backoff, capped at POLL_MAX_DELAY
+            delay = POLL_INITIAL_DELAY
+            for i in range(POLL_ATTEMPTS):
                 print(f"Poll attempt {i+1}...")
-                status_req = urllib.request.Request(status_url, headers=headers, method='GET')
-                
-                with urllib.request.urlopen(status_req, timeout=10) as status_response:
-                    status_data = json.loads(status_response.read().decode('utf-8'))
+                status_response = SESSION.get(status_url, headers=headers, timeout=10)
+                status_response.raise_for_status()
+                status_data = status_response.json()
                 
                 print(f"Status: {status_data.get('status')}")
                 
@@ -83,12 +93,13 @@ def main():
                     
                     # Get the final result
                     response_url = initial_response.get("response_url")
-                    result_req = urllib.request.Request(response_url, headers=headers, method='GET')
+                    result_response = SESSION.get(response_url, headers=headers, timeout=10)
+                    result_response.raise_for_status()
+                    result = result_response.json()
                     
-                    with urllib.request.urlopen(result_req, timeout=10) as result_response:
-                        result = json.loads(result_response.read().decode('utf-8'))
-                        
-                    print(f"Final result: {json.dumps(result, indent=2)}")
+                    sys.stdout.write("Final result: ")
+                    json.dump(result, sys.stdout, indent=2)
+                    sys.stdout.write("\n")
                     
                     # Check for images
                     if "images" in result and len(result["images"]) > 0:
@@ -102,8 +113,13 @@ def main():
                     print(f"❌ Request {status_data.get('status').lower()}")
                     return False
                     
-                # Wait before next poll
-                time.sleep(5)
+                # Wait before next poll, preferring the server's Retry-After
+                retry_after = status_response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    time.sleep(int(retry_after))
+                else:
+                    time.sleep(delay + random.uniform(0, delay / 10))
+                delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
                 
             print("❌ Timed out waiting for completion")
             return False
@@ -6,6 +6,7 @@ Tests both text-to-image and image-to-image endpoints.
 
 import sys
 import os
+import logging
 import time
 from pathlib import Path
 import tempfile
@@ -14,8 +15,7 @@ import urllib.request
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from shared.api import generate_image, edit_image, download_image, preview_cost
-from dotenv import load_dotenv
+# shared.api and dotenv are imported after check_dependencies has run
 
 # Check if required packages are installed, install if missing
 def check_dependencies():
@@ -27,12 +27,28 @@ def check_dependencies():
         import subprocess
         subprocess.call([sys.executable, "-m", "pip", "install", "python-dotenv"])
 
-def test_api_connectivity():
+def make_session():
+    """Keep-alive session shared by every request of the test run."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    return session
+
+
+def test_api_connectivity(session=None):
     """
     Test fal.ai API connectivity using both endpoints.
+    
+    Args:
+        session: Optional requests.Session reused for every API call and
+            download, so the TLS handshakes are paid once
     """
     print("\n🧪 Testing fal.ai API connectivity\n")
     
+    from shared.api import generate_image, edit_image, download_image, preview_cost
+    
     # Test key loading
     try:
         from shared.api import load_api_key
@@ -60,7 +76,8 @@ def test_api_connectivity():
             prompt="A simple test image with blue background and white circle in the center",
             resolution="1K",
             num_images=1,
-            output_format="png"
+            output_format="png",
+            session=session
         )
         
         if "images" in result and len(result["images"]) > 0:
@@ -71,7 +88,7 @@ def test_api_connectivity():
             url = result["images"][0]["url"]
             
             print(f"Downloading image from URL: {url}")
-            downloaded_path = download_image(url, test_image_path)
+            downloaded_path = download_image(url, test_image_path, session=session)
             
             print(f"Image saved to: {downloaded_path}")
             
@@ -85,7 +102,8 @@ def test_api_connectivity():
                         prompt="Same image but with a red background instead of blue",
                         image_urls=[str(test_image_path)],
                         resolution="1K",
-                        num_images=1
+                        num_images=1,
+                        session=session
                     )
                     
                     if "images" in edit_result and len(edit_result["images"]) > 0:
@@ -96,7 +114,7 @@ def test_api_connectivity():
                         edit_url = edit_result["images"][0]["url"]
                         
                         print(f"Downloading edited image from URL: {edit_url}")
-                        downloaded_edit_path = download_image(edit_url, edit_image_path)
+                        downloaded_edit_path = download_image(edit_url, edit_image_path, session=session)
                         
                         print(f"Edited image saved to: {downloaded_edit_path}")
                         
@@ -131,6 +149,7 @@ if __name__ == "__main__":
     check_dependencies()
     
     # Load .env file
+    from dotenv import load_dotenv
     dotenv_path = Path(__file__).parent.parent / ".env"
     if dotenv_path.exists():
         load_dotenv(dotenv_path)
@@ -143,8 +162,10 @@ if __name__ == "__main__":
     test_output_dir.mkdir(exist_ok=True)
     print(f"Test output will be saved to: {test_output_dir}")
     
-    # Run the test
-    success = test_api_connectivity()
+    # Run the test, showing the API's queue progress while waiting
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with make_session() as session:
+        success = test_api_connectivity(session)
     
     # Exit with appropriate code
     sys.exit(0 if success else 1)
\ No newline at end of file
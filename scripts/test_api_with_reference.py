@@ -5,6 +5,7 @@ Test fal.ai API with a reference image (image-to-image functionality).
 
 import sys
 import os
+import logging
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -75,5 +76,7 @@ def test_api_with_reference():
         return False
 
 if __name__ == "__main__":
+    # Show the API's queue progress while waiting
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     success = test_api_with_reference()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -14,14 +14,21 @@ COST CONTROL TIPS:
 """
 
 import json
+import logging
 import os
-import base64
-import mimetypes
-import urllib.request
-import urllib.error
+import hashlib
+import shutil
+import functools
 import time
 from pathlib import Path
-from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Queue progress is logged here; configure logging (e.g. at INFO) to see it
+log = logging.getLogger("nanobot.api")
 
 # API Endpoints
 ENDPOINTS = {
@@ -29,15 +36,45 @@ ENDPOINTS = {
     "image_to_image": "https://queue.fal.run/fal-ai/nano-banana-pro/edit",
 }
 
+# Headers sent with every API request, besides the Authorization key
+API_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+}
+
+# Responses to seeded (deterministic) requests, reused instead of paying
+# for the same images again. Set NANOBOT_CACHE_DISABLE=1 to bypass.
+RESPONSE_CACHE_DIR = Path(os.environ.get("NANOBOT_CACHE", "~/.cache/nanobot")).expanduser() / "responses"
+
+# Seconds a cached response is reused; the image URLs it holds expire
+RESPONSE_CACHE_TTL = 24 * 60 * 60
+
+# Bytes buffered per read while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Queue polling: first wait, and growth factor per poll
+POLL_INITIAL_DELAY = 0.25
+POLL_BACKOFF = 1.8
+
+# Image references passed to the API as-is rather than read from disk
+URL_PREFIXES = ("http://", "https://", "data:")
+
+# Queue statuses after which a request no longer changes
+FINAL_STATUSES = ("COMPLETED", "FAILED", "CANCELED")
+
 # Cost constants
 COST_PER_IMAGE = 0.15  # Base cost in USD
 COST_4K_MULTIPLIER = 2.0  # 4K costs 2x
 
 
+@functools.lru_cache(maxsize=16)
 def estimate_cost(num_images=1, resolution="1K"):
     """
     Estimate the cost for a generation request.
     
+    Memoized: there are only a dozen valid (num_images, resolution) pairs,
+    so it is cheap to call in planning loops.
+    
     Args:
         num_images: Number of images to generate (1-4)
         resolution: "1K", "2K", or "4K"
@@ -51,8 +88,62 @@ def estimate_cost(num_images=1, resolution="1K"):
     return base
 
 
+@functools.lru_cache(maxsize=1)
+def _default_session():
+    """
+    Default keep-alive session, exposed as SESSION.
+    
+    The queue submit, every status poll, the result fetch and image downloads
+    reuse pooled connections per host. Retry covers connection failures and,
+    for the idempotent GETs, transient 502/503/504 responses. Built on first
+    use, so importing this module for cost estimates does not load requests.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    ))
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def _async_executor():
+    """
+    Thread pool behind the async API, exposed as ASYNC_EXECUTOR.
+    
+    It runs the blocking calls, and is sized to the session's connection
+    pool so concurrent calls never wait on a connection. Built on first
+    use, like _default_session.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="nanobot-api")
+
+
+def __getattr__(name):
+    # SESSION and ASYNC_EXECUTOR are created lazily on first use
+    if name == "SESSION":
+        return _default_session()
+    if name == "ASYNC_EXECUTOR":
+        return _async_executor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=1)
 def load_api_key():
-    """Load API key from environment or .env file."""
+    """
+    Load API key from environment or .env file.
+    
+    The key is looked up once per process; call load_api_key.cache_clear()
+    to pick up a changed FAL_KEY or .env.
+    """
+    from dotenv import load_dotenv
+    
     # Try to find .env in parent directories
     current = Path(__file__).parent
     for _ in range(3):  # Check up to 3 levels
@@ -71,17 +162,106 @@ def load_api_key():
     return api_key
 
 
+# Bytes read per base64 step; a multiple of 3, so no chunk but the last pads
+DATA_URI_CHUNK_SIZE = 57 * 1024
+
+# Files at least this large are encoded from a memory map, where skipping
+# the copy into user space outweighs the cost of setting up the mapping
+DATA_URI_MMAP_THRESHOLD = 1024 * 1024
+
+
+# Leading bytes of the image formats the API accepts
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def _sniff_content_type(head):
+    """Return the content type for the first 12 bytes of an image, or None."""
+    for signature, file_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return file_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _content_type(ext):
+    """Return the image content type for a file extension (without the dot)."""
+    import mimetypes
+    
+    if not ext:
+        return "application/octet-stream"
+    if not mimetypes.inited:
+        mimetypes.init()
+    file_type = mimetypes.types_map.get("." + ext.lower())
+    if file_type and file_type.startswith("image/"):
+        return file_type
+    return f"image/{ext}"
+
+
 def image_to_data_uri(image_path):
-    """Convert a local image file to a data URI."""
-    with open(image_path, "rb") as f:
-        file_data = f.read()
+    """
+    Convert a local image file to a data URI.
+    
+    Results are memoized per file path, modification time and size, so an
+    unchanged reference image is only read and encoded once per process.
+    """
+    st = os.stat(image_path)
+    return _encode_data_uri(os.path.abspath(image_path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _encode_data_uri(image_path, mtime_ns, size):
+    """
+    Read and base64-encode image_path; mtime_ns and size key the cache.
     
-    file_type = mimetypes.guess_type(image_path)[0] or "application/octet-stream"
-    file_ext = os.path.splitext(image_path)[1].lstrip(".")
-    if not file_type.startswith("image/"):
-        file_type = f"image/{file_ext}"
+    A ".b64" file (e.g. cover.png.b64) already holds base64 text and is used
+    as-is. Otherwise the content type comes from the file's leading bytes,
+    falling back to its extension.
+    """
+    import base64
+    import mmap
+    
+    root, ext = os.path.splitext(image_path)
+    if ext.lower() == ".b64":
+        with open(image_path, "rb") as f:
+            encoded = b"".join(f.read().split())
+        try:
+            head = base64.b64decode(encoded[:16 if len(encoded) >= 16 else len(encoded) // 4 * 4],
+                                    validate=True)
+            text = encoded.decode("ascii")
+        except ValueError as e:  # binascii.Error and UnicodeDecodeError
+            raise ValueError(f"Invalid base64 sidecar {image_path}: {e}") from e
+        file_type = _sniff_content_type(head) or _content_type(os.path.splitext(root)[1].lstrip("."))
+        return f"data:{file_type};base64,{text}"
+    
+    with open(image_path, "rb") as f:
+        file_type = _sniff_content_type(f.read(12)) or _content_type(ext.lstrip("."))
+        f.seek(0)
+        
+        # Encode chunk by chunk into one buffer rather than holding the raw
+        # file and its encoding side by side
+        uri = bytearray(b"data:" + file_type.encode("ascii") + b";base64,")
+        if size >= DATA_URI_MMAP_THRESHOLD:
+            # Encode straight from the page cache; fall back to plain reads
+            # on filesystems that cannot be mapped
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        for start in range(0, len(view), DATA_URI_CHUNK_SIZE):
+                            uri += base64.b64encode(view[start:start + DATA_URI_CHUNK_SIZE])
+                    return uri.decode("ascii")
+            except (ValueError, OSError):
+                pass
+        while chunk := f.read(DATA_URI_CHUNK_SIZE):
+            uri += base64.b64encode(chunk)
     
-    return f"data:{file_type};base64,{base64.b64encode(file_data).decode('utf-8')}"
+    return uri.decode("ascii")
 
 
 def prepare_image_urls(image_paths):
@@ -90,19 +270,97 @@ def prepare_image_urls(image_paths):
     Handles local files, URLs, and data URIs.
     """
     urls = []
+    local_files = {}  # path -> indexes in urls, so repeats are encoded once
     for path in image_paths:
-        if isinstance(path, str):
-            if path.startswith(("http://", "https://", "data:")):
-                urls.append(path)
-            else:
-                # Local file
-                urls.append(image_to_data_uri(path))
-        else:
+        if not isinstance(path, str):
             raise ValueError(f"Invalid image path type: {type(path)}")
+        if path.startswith(URL_PREFIXES):
+            urls.append(path)
+        else:
+            # Local file, encoded below
+            local_files.setdefault(path, []).append(len(urls))
+            urls.append(None)
+    
+    # Read and encode local files concurrently; base64 releases the GIL
+    if len(local_files) == 1:
+        encoded = [image_to_data_uri(next(iter(local_files)))]
+    elif local_files:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(local_files))) as executor:
+            encoded = list(executor.map(image_to_data_uri, local_files))
+    else:
+        encoded = []
+    for indexes, uri in zip(local_files.values(), encoded):
+        for i in indexes:
+            urls[i] = uri
     return urls
 
 
-def call_api(endpoint, payload, timeout=120, max_poll_attempts=30, poll_interval=4):
+@functools.lru_cache(maxsize=1)
+def _api_headers(api_key):
+    """Request headers for api_key; the returned dict must not be modified."""
+    return {**API_HEADERS, "Authorization": f"Key {api_key}"}
+
+
+def _wait_on_status_stream(http, status_url, headers, timeout, deadline):
+    """
+    Follow a queued request's server-sent status stream to a final status.
+    
+    Returns the final status dict, or None if the stream is unavailable,
+    ends early or outlives the deadline; the caller then polls instead.
+    """
+    import requests
+    
+    stream_headers = {**headers, "Accept": "text/event-stream"}
+    read_timeout = max(1.0, deadline - time.monotonic())
+    try:
+        with http.get(f"{status_url}/stream", headers=stream_headers, stream=True,
+                      timeout=(timeout, read_timeout)) as response:
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code != 200 or not content_type.startswith("text/event-stream"):
+                return None
+            
+            last_status = None
+            for line in response.iter_lines(decode_unicode=True):
+                if time.monotonic() > deadline:
+                    return None
+                if not line or not line.startswith("data:"):
+                    continue
+                try:
+                    status_data = json.loads(line[5:])
+                except ValueError:
+                    continue
+                
+                status = status_data.get("status")
+                if status != last_status:
+                    log.info("Request status: %s", status)
+                    last_status = status
+                if status in FINAL_STATUSES:
+                    return status_data
+    except requests.RequestException:
+        return None
+    return None
+
+
+def _queue_result(http, initial_response, status_data, headers, timeout):
+    """Fetch the result of a queued request that reached a final status."""
+    status = status_data.get("status")
+    if status != "COMPLETED":
+        error_msg = status_data.get("error", f"Request {status.lower()}")
+        raise RuntimeError(f"API request failed: {error_msg}")
+    
+    # Get the final result
+    response_url = initial_response.get("response_url")
+    if not response_url:
+        raise RuntimeError("Response URL not found in queue response")
+    
+    result_response = http.get(response_url, headers=headers, timeout=timeout)
+    result_response.raise_for_status()
+    return result_response.json()
+
+
+def call_api(endpoint, payload, timeout=120, max_poll_attempts=30, poll_interval=4, session=None):
     """
     Make an API call to fal.ai with polling for queue-based responses.
     
@@ -110,96 +368,173 @@ def call_api(endpoint, payload, timeout=120, max_poll_attempts=30, poll_interval
         endpoint: The API endpoint URL
         payload: Request payload as dictionary
         timeout: Single request timeout in seconds
-        max_poll_attempts: Maximum number of status check attempts
-        poll_interval: Wait time between polls in seconds
+        max_poll_attempts: Bounds the total wait to max_poll_attempts * poll_interval
+        poll_interval: Longest wait between polls in seconds; polling starts
+            at POLL_INITIAL_DELAY and backs off up to it
+        session: requests.Session to use instead of the module's SESSION
         
     Returns:
         The completed API response
     """
-    api_key = load_api_key()
+    import requests
     
-    headers = {
-        "Authorization": f"Key {api_key}",
-        "Content-Type": "application/json"
-    }
+    # Built once per key and reused by the submit, every poll and the result
+    headers = _api_headers(load_api_key())
     
-    data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(endpoint, data=data, headers=headers, method='POST')
+    # orjson serializes straight to bytes; json.dumps output is ASCII-only
+    # (ensure_ascii), so its cheap ASCII encode is enough
+    data = orjson.dumps(payload) if orjson else json.dumps(payload).encode('ascii')
+    http = session if session is not None else _default_session()
     
     try:
         # Initial request submission
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            initial_response = json.loads(response.read().decode('utf-8'))
-            
+        response = http.post(endpoint, data=data, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        initial_response = response.json()
+        
         # Check if the response is already complete
         if "images" in initial_response:
             return initial_response
             
         # Handle queue-based response
         if "status" in initial_response and initial_response["status"] == "IN_QUEUE":
-            print(f"Request queued. Waiting for processing...")
+            log.info("Request queued. Waiting for processing...")
             
             # Get the status URL for polling
             status_url = initial_response.get("status_url")
             if not status_url:
                 raise RuntimeError("Status URL not found in queue response")
                 
-            # Poll for result
-            import time
-            for attempt in range(max_poll_attempts):
-                print(f"Polling attempt {attempt+1}/{max_poll_attempts}...")
-                status_req = urllib.request.Request(status_url, headers=headers, method='GET')
-                
+            # Wait at most max_poll_attempts * poll_interval seconds in total
+            deadline = time.monotonic() + max_poll_attempts * poll_interval
+            
+            # Follow the server-sent status stream, which reports the final
+            # status as soon as it is reached; poll if it is unavailable
+            status_data = _wait_on_status_stream(http, status_url, headers, timeout, deadline)
+            if status_data is not None:
+                return _queue_result(http, initial_response, status_data, headers, timeout)
+            
+            # Poll with exponential backoff capped at poll_interval
+            delay = POLL_INITIAL_DELAY
+            attempts = 0
+            last_status = None
+            while True:
+                attempts += 1
                 try:
-                    with urllib.request.urlopen(status_req, timeout=timeout) as status_response:
-                        status_data = json.loads(status_response.read().decode('utf-8'))
-                        
-                    # Check status
+                    status_response = http.get(status_url, headers=headers, timeout=timeout)
+                    retry_after = status_response.headers.get("Retry-After")
+                    status_response.raise_for_status()
+                    status_data = status_response.json()
+                    
+                    # Check status, reporting only when it changes
                     status = status_data.get("status")
-                    if status == "COMPLETED":
-                        # Get the final result
-                        response_url = initial_response.get("response_url")
-                        if not response_url:
-                            raise RuntimeError("Response URL not found in queue response")
-                            
-                        result_req = urllib.request.Request(response_url, headers=headers, method='GET')
-                        with urllib.request.urlopen(result_req, timeout=timeout) as result_response:
-                            return json.loads(result_response.read().decode('utf-8'))
-                            
-                    elif status in ["FAILED", "CANCELED"]:
-                        error_msg = status_data.get("error", f"Request {status.lower()}")
-                        raise RuntimeError(f"API request failed: {error_msg}")
-                        
-                    # Still processing, wait and try again
-                    time.sleep(poll_interval)
+                    if status != last_status:
+                        log.info("Request status: %s", status)
+                        last_status = status
+                    
+                    if status in FINAL_STATUSES:
+                        return _queue_result(http, initial_response, status_data, headers, timeout)
                     
-                except urllib.error.HTTPError as e:
-                    error_body = e.read().decode('utf-8') if e.fp else str(e)
-                    print(f"Polling error: {e.code} - {error_body}")
-                    time.sleep(poll_interval)
+                except requests.HTTPError as e:
+                    retry_after = e.response.headers.get("Retry-After")
+                    log.warning("Polling error: %s - %s", e.response.status_code, e.response.text)
+                
+                # Still processing, wait (longer if the server asks) and retry
+                wait = min(delay, poll_interval)
+                try:
+                    wait = max(wait, float(retry_after))
+                except (TypeError, ValueError):
+                    pass
+                if time.monotonic() + wait > deadline:
+                    break
+                time.sleep(wait)
+                delay *= POLL_BACKOFF
                     
-            raise RuntimeError(f"Timed out waiting for API response after {max_poll_attempts} attempts")
+            raise RuntimeError(f"Timed out waiting for API response after {attempts} attempts")
             
         # Return whatever we got if not a queue response
         return initial_response
         
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8') if e.fp else str(e)
-        raise RuntimeError(f"API Error {e.code}: {error_body}")
-    except urllib.error.URLError as e:
-        raise RuntimeError(f"Connection Error: {e.reason}")
+    except requests.HTTPError as e:
+        raise RuntimeError(f"API Error {e.response.status_code}: {e.response.text}")
+    except requests.RequestException as e:
+        raise RuntimeError(f"Connection Error: {e}")
 
 
-def download_image(url, output_path):
-    """Download an image from a URL to a local path."""
-    req = urllib.request.Request(url)
-    with urllib.request.urlopen(req, timeout=60) as response:
+def call_api_cached(endpoint, payload, session=None):
+    """
+    call_api with an on-disk cache for requests that fix a seed.
+    
+    The response is stored under a hash of the endpoint and payload, so
+    the same seeded request returns instantly and at no cost. Requests
+    without a seed are not deterministic and always go to the API.
+    
+    A response served from the cache has "cached": True, so callers can
+    skip reporting or tracking a cost. Entries older than
+    RESPONSE_CACHE_TTL are fetched again, since their URLs may be dead.
+    """
+    if payload.get("seed") is None or os.environ.get("NANOBOT_CACHE_DISABLE"):
+        return call_api(endpoint, payload, session=session)
+    
+    key = hashlib.blake2b(
+        json.dumps([endpoint, payload], sort_keys=True).encode('utf-8'), digest_size=16
+    ).hexdigest()
+    cache_path = RESPONSE_CACHE_DIR / f"{key}.json"
+    try:
+        with open(cache_path, 'rb') as f:
+            if time.time() - os.fstat(f.fileno()).st_mtime < RESPONSE_CACHE_TTL:
+                return dict(json.load(f), cached=True)
+    except (OSError, ValueError, TypeError):
+        pass
+    
+    result = call_api(endpoint, payload, session=session)
+    if result.get("images"):
+        try:
+            RESPONSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return result
+
+
+def download_image(url, output_path, session=None):
+    """Download an image from a URL to a local path, over session or SESSION."""
+    http = session if session is not None else _default_session()
+    with http.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'wb') as f:
-            f.write(response.read())
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
     return str(output_path)
 
 
+def download_images(url_path_pairs, max_workers=4, session=None):
+    """
+    Download several images concurrently.
+    
+    Args:
+        url_path_pairs: Iterable of (url, output_path) pairs
+        max_workers: Maximum number of simultaneous downloads
+        session: requests.Session to use instead of the module's SESSION
+    
+    Returns:
+        List of saved paths (as strings), in the order given
+    """
+    pairs = list(url_path_pairs)
+    if len(pairs) <= 1:
+        return [download_image(url, path, session) for url, path in pairs]
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as executor:
+        futures = [executor.submit(download_image, url, path, session) for url, path in pairs]
+        return [future.result() for future in futures]
+
+
 def generate_image(
     prompt,
     resolution="1K",
@@ -210,6 +545,7 @@ def generate_image(
     limit_generations=True,
     enable_web_search=False,
     sync_mode=False,
+    session=None,
 ):
     """
     Generate images from text prompt.
@@ -224,6 +560,7 @@ def generate_image(
         limit_generations: If True, ignore prompt instructions for multiple images (RECOMMENDED for cost control)
         enable_web_search: Allow model to search web (default False)
         sync_mode: Return as data URI instead of URL (default False)
+        session: requests.Session to use instead of the module's SESSION
     
     Returns:
         API response with generated images
@@ -244,7 +581,7 @@ def generate_image(
     if seed is not None:
         payload["seed"] = seed
     
-    return call_api(ENDPOINTS["text_to_image"], payload)
+    return call_api_cached(ENDPOINTS["text_to_image"], payload, session=session)
 
 
 def edit_image(
@@ -258,6 +595,7 @@ def edit_image(
     limit_generations=True,
     enable_web_search=False,
     sync_mode=False,
+    session=None,
 ):
     """
     Edit/transform images using reference images and a prompt.
@@ -273,6 +611,7 @@ def edit_image(
         limit_generations: If True, ignore prompt instructions for multiple images (RECOMMENDED)
         enable_web_search: Allow model to search web (default False)
         sync_mode: Return as data URI instead of URL (default False)
+        session: requests.Session to use instead of the module's SESSION
     
     Returns:
         API response with edited images
@@ -297,7 +636,41 @@ def edit_image(
     if seed is not None:
         payload["seed"] = seed
     
-    return call_api(ENDPOINTS["image_to_image"], payload)
+    return call_api_cached(ENDPOINTS["image_to_image"], payload, session=session)
+
+
+async def _run_async(func, *args, **kwargs):
+    """Run a blocking API function on the async executor and await its result."""
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_async_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def acall_api(endpoint, payload, **kwargs):
+    """Async call_api; takes the same arguments."""
+    return await _run_async(call_api, endpoint, payload, **kwargs)
+
+
+async def adownload_image(url, output_path, session=None):
+    """Async download_image; takes the same arguments."""
+    return await _run_async(download_image, url, output_path, session)
+
+
+async def agenerate_image(prompt, **kwargs):
+    """
+    Async generate_image; takes the same arguments.
+    
+    Lets callers keep many generations in flight at once, e.g.:
+        results = await asyncio.gather(*(agenerate_image(p) for p in prompts))
+    At most ASYNC_EXECUTOR's worker count run at a time; the rest queue.
+    """
+    return await _run_async(generate_image, prompt, **kwargs)
+
+
+async def aedit_image(prompt, image_urls, **kwargs):
+    """Async edit_image; takes the same arguments."""
+    return await _run_async(edit_image, prompt, image_urls, **kwargs)
 
 
 # Convenience function to show cost before generating
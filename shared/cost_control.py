@@ -7,20 +7,311 @@ excessive API usage and unexpected charges.
 IMPORTANT: These safeguards should be used with ALL API calls!
 """
 
+import atexit
+import contextlib
+import json
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 
-# Cost tracking log file
+# Cost tracking log file, one JSON entry per line. COST_LOG_PATH is the
+# older single-document log, migrated into COST_LOG_JSONL on first use.
 COST_LOG_PATH = Path(__file__).parent.parent / "cost_log.json"
+COST_LOG_JSONL = COST_LOG_PATH.with_suffix(".jsonl")
+
+# Running totals of the cost log, with the log size and inode they cover
+COST_LOG_SUMMARY = COST_LOG_PATH.with_name("cost_log_summary.json")
+
+# Buffered entries are appended together once either cap is reached, and
+# before the log is read or the process exits
+COST_LOG_MAX_PENDING = 100
+COST_LOG_MAX_PENDING_BYTES = 64 * 1024
 
 # Maximum default daily spend
 DEFAULT_DAILY_LIMIT = 5.0  # $5.00 maximum per day
 
 # Global tracking
 _SESSION_COST = 0.0
+_MIGRATED = False
+_SUMMARY = None  # Last summary read or written by this process
+_PENDING = []  # Serialized entries not yet appended to the log
+_PENDING_BYTES = 0
+_LOG_DIR_READY = None  # Cost log directory once it is known to exist
+_ENV_SETTINGS = None  # NANOBOT_* environment settings, read on first use
+_TODAYS_SPEND = None  # (date, log inode, offset, spend) of the last check
+
+
+def migrate_cost_log():
+    """
+    Move entries from the old cost_log.json into the JSONL log.
+    
+    Runs at most once per process, and only when no JSONL log exists yet.
+    The old file is kept as cost_log.migrated.json.
+    """
+    global _MIGRATED
+    if _MIGRATED:
+        return
+    _MIGRATED = True
+    
+    if COST_LOG_JSONL.exists() or not COST_LOG_PATH.exists():
+        return
+    
+    try:
+        with open(COST_LOG_PATH, 'r') as f:
+            entries = json.load(f).get("entries", [])
+    except Exception as e:
+        print(f"Error migrating cost log: {e}")
+        return
+    
+    tmp_path = COST_LOG_JSONL.with_suffix(".jsonl.tmp")
+    with open(tmp_path, 'w') as f:
+        for entry in entries:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+    os.replace(tmp_path, COST_LOG_JSONL)
+    os.replace(COST_LOG_PATH, COST_LOG_PATH.with_suffix(".migrated.json"))
+
+
+def append_cost_entry(entry, buffered=False):
+    """
+    Append a single entry to the cost log.
+    
+    Args:
+        entry: JSON-serializable dict describing one charged operation
+        buffered: Hold the entry in memory and append it with later ones
+            (see flush_cost_log) instead of writing it now
+    
+    Only new lines are written, so the cost does not grow with the log.
+    """
+    global _PENDING_BYTES
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    _PENDING.append(line)
+    _PENDING_BYTES += len(line)
+    if (not buffered or len(_PENDING) >= COST_LOG_MAX_PENDING
+            or _PENDING_BYTES >= COST_LOG_MAX_PENDING_BYTES):
+        flush_cost_log()
+
+
+def _atomic_append(path, data):
+    """
+    Append bytes to path with unbuffered O_APPEND writes.
+    
+    Each write lands at the current end of the file, so lines appended by
+    other processes are never overwritten; a write of up to a few KiB (a
+    typical batch) is not interleaved with theirs either.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def flush_cost_log():
+    """Append all buffered entries to the cost log in a single write."""
+    global _PENDING, _PENDING_BYTES, _LOG_DIR_READY
+    if not _PENDING:
+        return
+    
+    lines, _PENDING, _PENDING_BYTES = _PENDING, [], 0
+    migrate_cost_log()
+    if _LOG_DIR_READY != COST_LOG_JSONL.parent:
+        COST_LOG_JSONL.parent.mkdir(parents=True, exist_ok=True)
+        _LOG_DIR_READY = COST_LOG_JSONL.parent
+    _atomic_append(COST_LOG_JSONL, "".join(lines).encode("utf-8"))
+    
+    # Fold the new lines into the running totals; the entries are already
+    # logged, so a bad summary or log line must not fail the flush
+    try:
+        get_cost_summary()
+    except Exception as e:
+        print(f"Error updating cost summary: {e}")
+
+
+# Buffered entries must not be lost when the process ends normally
+atexit.register(flush_cost_log)
+
+
+@contextlib.contextmanager
+def cost_log_batch():
+    """
+    Context manager that writes buffered cost entries out when it exits.
+    
+    Usage:
+        with cost_log_batch():
+            for prompt in prompts:
+                safe_api_call(generate_image, 0.15, "generation", prompt)
+    """
+    try:
+        yield
+    finally:
+        flush_cost_log()
+
+
+def iter_cost_entries():
+    """
+    Yield cost log entries in the order they were logged.
+    
+    Lines that cannot be parsed (e.g. a write cut short) are skipped.
+    """
+    flush_cost_log()
+    migrate_cost_log()
+    try:
+        f = open(COST_LOG_JSONL, 'r')
+    except FileNotFoundError:
+        return
+    
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _iter_entries_reversed(block_size=64 * 1024):
+    """
+    Yield cost log entries newest first, reading the log backwards in blocks.
+    
+    Lines that cannot be parsed are skipped, as in iter_cost_entries.
+    """
+    flush_cost_log()
+    migrate_cost_log()
+    try:
+        f = open(COST_LOG_JSONL, 'rb')
+    except FileNotFoundError:
+        return
+    
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        head = b""  # Start of the earliest line read so far, maybe partial
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + head).split(b"\n")
+            head = lines.pop(0)
+            for line in reversed(lines):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        try:
+            yield json.loads(head)
+        except ValueError:
+            pass
+
+
+def _iter_entries_from(offset):
+    """
+    Yield (end offset, entry) for each complete line from offset onward.
+    
+    Unparseable lines yield None as the entry, so callers still see how far
+    the log was read. A final line without a newline is still being written
+    and is left for the next read.
+    """
+    with open(COST_LOG_JSONL, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            try:
+                yield offset, json.loads(line)
+            except ValueError:
+                yield offset, None
+
+
+def get_cost_summary():
+    """
+    Return the all-time totals of the cost log.
+    
+    Returns:
+        Dict with "total_cost" (USD) and "entries" (number of entries)
+    
+    The totals are kept in COST_LOG_SUMMARY along with how far into the log
+    they reach, so only lines appended since (by any process) are read. A
+    log that was replaced or truncated is summed again from the start.
+    """
+    global _SUMMARY
+    flush_cost_log()
+    migrate_cost_log()
+    try:
+        st = os.stat(COST_LOG_JSONL)
+    except FileNotFoundError:
+        return {"total_cost": 0.0, "entries": 0}
+    
+    summary = _SUMMARY
+    if summary is None:
+        try:
+            with open(COST_LOG_SUMMARY, 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            summary = {}
+        if not isinstance(summary, dict):
+            summary = {}
+    
+    offset = summary.get("offset", 0)
+    if summary.get("inode") != st.st_ino or offset > st.st_size:
+        summary, offset = {}, 0
+    total = summary.get("total_cost", 0.0)
+    entries = summary.get("entries", 0)
+    
+    if offset < st.st_size or not summary:
+        for offset, entry in _iter_entries_from(offset):
+            try:
+                total += entry.get("cost", 0)
+                entries += 1
+            except (AttributeError, TypeError):
+                continue
+        
+        summary = {"total_cost": total, "entries": entries, "offset": offset, "inode": st.st_ino}
+        tmp_path = COST_LOG_SUMMARY.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(summary, f, separators=(",", ":"))
+            os.replace(tmp_path, COST_LOG_SUMMARY)
+        except OSError:
+            pass
+    
+    _SUMMARY = summary
+    return {"total_cost": total, "entries": entries}
+
+
+def _env_settings():
+    """
+    Return the NANOBOT_* settings, read from the environment once.
+    
+    Call refresh_env() after changing them, e.g. in tests.
+    """
+    global _ENV_SETTINGS
+    if _ENV_SETTINGS is None:
+        limit = os.environ.get("NANOBOT_DAILY_LIMIT")
+        try:
+            daily_limit = float(limit) if limit else DEFAULT_DAILY_LIMIT
+        except ValueError:
+            daily_limit = DEFAULT_DAILY_LIMIT
+        
+        _ENV_SETTINGS = {
+            "skip_confirm": os.environ.get("NANOBOT_SKIP_CONFIRM") == "1",
+            "dry_run": os.environ.get("NANOBOT_DRY_RUN") == "1",
+            "daily_limit": daily_limit,
+        }
+    return _ENV_SETTINGS
+
+
+def refresh_env():
+    """Make the next check re-read the NANOBOT_* environment settings."""
+    global _ENV_SETTINGS
+    _ENV_SETTINGS = None
+
+
+def _is_dry_run():
+    """Check whether dry run mode (NANOBOT_DRY_RUN=1) is enabled."""
+    return _env_settings()["dry_run"]
 
 
 def cost_confirmation(cost, description="API call"):
@@ -40,12 +331,12 @@ def cost_confirmation(cost, description="API call"):
     print(f"\n⚠️ COST WARNING: This {description} will cost ${cost:.2f}")
     
     # Skip in CI/CD environments or if explicitly disabled
-    if os.environ.get("NANOBOT_SKIP_CONFIRM") == "1":
+    if _env_settings()["skip_confirm"]:
         print("Automatic confirmation (NANOBOT_SKIP_CONFIRM=1)")
         return True
     
     # Check for dry run mode
-    if os.environ.get("NANOBOT_DRY_RUN") == "1":
+    if _is_dry_run():
         print("Skipping API call (NANOBOT_DRY_RUN=1)")
         return False
     
@@ -74,13 +365,14 @@ def track_cost(cost, operation_type, details=None):
         operation_type: Type of operation (e.g., "generate", "edit")
         details: Additional details (e.g., resolution, num_images)
     
-    This helps monitor and audit API usage over time.
+    This helps monitor and audit API usage over time. Nothing is tracked
+    in dry run mode (NANOBOT_DRY_RUN=1), where no money is spent.
     """
     global _SESSION_COST
-    _SESSION_COST += cost
+    if _is_dry_run():
+        return
     
-    import json
-    from datetime import datetime
+    _SESSION_COST += cost
     
     # Create log entry
     entry = {
@@ -91,29 +383,45 @@ def track_cost(cost, operation_type, details=None):
         "cumulative_session": _SESSION_COST,
     }
     
-    # Load existing log
-    try:
-        if COST_LOG_PATH.exists():
-            with open(COST_LOG_PATH, 'r') as f:
-                log = json.load(f)
-        else:
-            log = {"entries": [], "total_cost": 0.0}
-    except Exception as e:
-        print(f"Error loading cost log: {e}")
-        log = {"entries": [], "total_cost": 0.0}
+    append_cost_entry(entry, buffered=True)
     
-    # Update log
-    log["entries"].append(entry)
-    log["total_cost"] = sum(e["cost"] for e in log["entries"])
-    log["last_updated"] = datetime.now().isoformat()
+    # Print confirmation
+    print(f"💰 Cost tracked: ${cost:.2f} for {operation_type}")
+    print(f"   Session total: ${_SESSION_COST:.2f}")
+
+
+def track_cost_batch(entries):
+    """
+    Track the costs of several API calls with a single log write.
+    
+    Args:
+        entries: Iterable of (cost, operation_type, details) tuples, as
+            passed to track_cost
+    
+    Like track_cost, nothing is tracked in dry run mode.
+    """
+    global _SESSION_COST
+    if _is_dry_run():
+        return
     
-    # Save log
-    COST_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(COST_LOG_PATH, 'w') as f:
-        json.dump(log, f, indent=2)
+    timestamp = datetime.now().isoformat()
+    batch_cost = 0.0
+    count = 0
+    for cost, operation_type, details in entries:
+        _SESSION_COST += cost
+        batch_cost += cost
+        count += 1
+        append_cost_entry({
+            "timestamp": timestamp,
+            "cost": cost,
+            "operation": operation_type,
+            "details": details or {},
+            "cumulative_session": _SESSION_COST,
+        }, buffered=True)
+    flush_cost_log()
     
     # Print confirmation
-    print(f"💰 Cost tracked: ${cost:.2f} for {operation_type}")
+    print(f"💰 Cost tracked: ${batch_cost:.2f} for {count} operation(s)")
     print(f"   Session total: ${_SESSION_COST:.2f}")
 
 
@@ -127,32 +435,46 @@ def get_cost_report(days=7):
     Returns:
         Formatted cost report as string
     """
-    import json
-    from datetime import datetime, timedelta
-    
     try:
-        if not COST_LOG_PATH.exists():
+        flush_cost_log()
+        migrate_cost_log()
+        if not COST_LOG_JSONL.exists():
             return "No cost log found."
         
-        with open(COST_LOG_PATH, 'r') as f:
-            log = json.load(f)
-        
-        if not log.get("entries"):
-            return "No cost entries found."
-        
         # Calculate date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
-        # Filter entries by date
+        # Filter entries by date; timestamps as written by track_cost
+        # order as strings, so only other formats need parsing
+        start_str = start_date.isoformat()
+        end_str = end_date.isoformat()
+        
+        # The log is in time order, give or take entries another process
+        # buffered for a while, so reading newest first can stop once it is
+        # a day past the start of the window
+        stop_str = (start_date - timedelta(days=1)).isoformat()
+        
+        has_entries = False
         filtered_entries = []
-        for entry in log["entries"]:
+        for entry in _iter_entries_reversed():
+            has_entries = True
             try:
-                entry_date = datetime.fromisoformat(entry["timestamp"])
-                if start_date <= entry_date <= end_date:
+                timestamp = entry["timestamp"]
+                if _is_plain_timestamp(timestamp):
+                    if timestamp < stop_str:
+                        break
+                    in_range = start_str <= timestamp <= end_str
+                else:
+                    in_range = start_date <= datetime.fromisoformat(timestamp) <= end_date
+                if in_range and isinstance(entry["cost"], (int, float)):
                     filtered_entries.append(entry)
-            except (ValueError, KeyError):
+            except (ValueError, KeyError, TypeError):
                 continue
+        filtered_entries.reverse()
+        
+        if not has_entries:
+            return "No cost entries found."
         
         if not filtered_entries:
             return f"No cost entries found in the last {days} days."
@@ -183,39 +505,65 @@ def get_cost_report(days=7):
         return f"Error generating cost report: {e}"
 
 
+def _is_plain_timestamp(timestamp):
+    """
+    Check for a naive timestamp in datetime.isoformat()'s own layout.
+    
+    Such timestamps sort as strings in time order, and their first ten
+    characters are the date, so they can be compared without parsing.
+    """
+    return isinstance(timestamp, str) and len(timestamp) in (19, 26) and timestamp[10] == "T"
+
+
 def _get_daily_limit():
     """Get the configured daily spending limit."""
-    limit = os.environ.get("NANOBOT_DAILY_LIMIT")
-    try:
-        return float(limit) if limit else DEFAULT_DAILY_LIMIT
-    except ValueError:
-        return DEFAULT_DAILY_LIMIT
+    return _env_settings()["daily_limit"]
 
 
 def _get_todays_spend():
-    """Calculate how much has been spent today."""
-    import json
-    from datetime import datetime
+    """
+    Calculate how much has been spent today.
     
+    The result is remembered with how far into the log it reaches, so
+    repeated checks (e.g. one per confirmation in a batch) only read the
+    entries appended since.
+    """
+    global _TODAYS_SPEND
     today = datetime.now().date()
+    today_str = today.isoformat()
     
     try:
-        if not COST_LOG_PATH.exists():
+        flush_cost_log()
+        migrate_cost_log()
+        try:
+            st = os.stat(COST_LOG_JSONL)
+        except FileNotFoundError:
             return 0.0
         
-        with open(COST_LOG_PATH, 'r') as f:
-            log = json.load(f)
+        # Continue from the last check if it was for today's date and the
+        # same, not truncated, log
+        offset, total = 0, 0.0
+        if _TODAYS_SPEND is not None:
+            cached_date, inode, cached_offset, cached_total = _TODAYS_SPEND
+            if cached_date == today_str and inode == st.st_ino and cached_offset <= st.st_size:
+                offset, total = cached_offset, cached_total
         
-        # Sum up today's entries
-        total = 0.0
-        for entry in log.get("entries", []):
+        # Sum up today's entries, comparing the date prefix where possible
+        for offset, entry in _iter_entries_from(offset):
+            if entry is None:
+                continue
             try:
-                entry_date = datetime.fromisoformat(entry["timestamp"]).date()
-                if entry_date == today:
+                timestamp = entry["timestamp"]
+                if _is_plain_timestamp(timestamp):
+                    is_today = timestamp[:10] == today_str
+                else:
+                    is_today = datetime.fromisoformat(timestamp).date() == today
+                if is_today:
                     total += entry.get("cost", 0.0)
-            except (ValueError, KeyError):
+            except (ValueError, KeyError, TypeError):
                 continue
         
+        _TODAYS_SPEND = (today_str, st.st_ino, offset, total)
         return total
     except Exception:
         return 0.0
@@ -246,7 +594,7 @@ def safe_api_call(api_func, cost_estimate, description, *args, **kwargs):
     This wraps API calls with cost confirmation and tracking.
     """
     # Check if dry run mode is enabled
-    if os.environ.get("NANOBOT_DRY_RUN") == "1":
+    if _is_dry_run():
         print(f"DRY RUN: Would call {api_func.__name__} (${cost_estimate:.2f})")
         return {"dry_run": True, "cost_estimate": cost_estimate}
     
@@ -263,4 +611,54 @@ def safe_api_call(api_func, cost_estimate, description, *args, **kwargs):
     except Exception as e:
         print(f"API call failed: {e}")
         # Don't track cost for failed calls
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
+
+
+def safe_api_batch(calls):
+    """
+    Safely run several API calls with one confirmation for their total cost.
+    
+    Args:
+        calls: List of (api_func, cost_estimate, description, args, kwargs)
+            tuples, each as would be passed to safe_api_call
+    
+    Returns:
+        List with one entry per call: the API response, or {"error": ...}
+        if it failed. None if the batch was rejected.
+    
+    The costs of the calls that succeed are logged together in one write;
+    failed calls are not tracked.
+    """
+    calls = list(calls)
+    total_estimate = sum(cost_estimate for _, cost_estimate, _, _, _ in calls)
+    
+    # Check if dry run mode is enabled
+    if _is_dry_run():
+        for api_func, cost_estimate, _, _, _ in calls:
+            print(f"DRY RUN: Would call {api_func.__name__} (${cost_estimate:.2f})")
+        return [{"dry_run": True, "cost_estimate": cost_estimate} for _, cost_estimate, _, _, _ in calls]
+    
+    # Get confirmation once for the whole batch
+    if not cost_confirmation(total_estimate, f"batch of {len(calls)} operations"):
+        print("Operation cancelled by user.")
+        return None
+    
+    # Call the API for each, tracking only the calls that succeed
+    results = []
+    tracked = []
+    for api_func, cost_estimate, description, args, kwargs in calls:
+        try:
+            results.append(api_func(*args, **kwargs))
+            tracked.append((cost_estimate, api_func.__name__, kwargs))
+        except Exception as e:
+            print(f"API call failed ({description}): {e}")
+            results.append({"error": str(e)})
+    
+    # The calls are already made (and charged), so their results are
+    # returned even if logging the costs fails
+    if tracked:
+        try:
+            track_cost_batch(tracked)
+        except Exception as e:
+            print(f"Cost tracking failed: {e}")
+    return results
@@ -15,11 +15,30 @@ Usage:
 """
 
 import argparse
-import subprocess
 import sys
 import os
 
 
+def load_env_file(path):
+    """
+    Set environment variables from a .env file in one pass.
+    
+    Variables already set in the environment, empty values and the
+    placeholder API key are left alone.
+    """
+    with open(path, "r") as f:
+        env = dict(
+            (part.strip() for part in line.split("=", 1))
+            for line in f.read().splitlines()
+            if "=" in line and not line.lstrip().startswith("#")
+        )
+    
+    os.environ.update({
+        name: value for name, value in env.items()
+        if value and value != "your_api_key_here" and os.environ.get(name) is None
+    })
+
+
 def run_tests(test_type=None):
     """Run tests of the specified type."""
     # Base pytest command
@@ -40,10 +59,11 @@ def run_tests(test_type=None):
     elif test_type == "dry":
         cmd.extend(["tests/test_generator.py::TestGenerator::test_dry_run_variations"])
     
-    # Run the tests
+    # Run the tests in this interpreter rather than a new pytest process
+    import pytest
+    
     print(f"Running command: {' '.join(cmd)}")
-    result = subprocess.run(cmd, stdout=sys.stdout, stderr=sys.stderr)
-    return result.returncode
+    return int(pytest.main(cmd[1:]))
 
 
 def main():
@@ -62,13 +82,7 @@ def main():
         if not os.environ.get("FAL_KEY"):
             # Check if .env file exists and load it
             if os.path.exists(".env"):
-                with open(".env", "r") as f:
-                    for line in f:
-                        if line.startswith("FAL_KEY="):
-                            key = line.strip().split("=", 1)[1]
-                            if key and key != "your_api_key_here":
-                                os.environ["FAL_KEY"] = key
-                                break
+                load_env_file(".env")
             
             # After trying to load from .env, check again
             if not os.environ.get("FAL_KEY"):
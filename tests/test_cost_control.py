@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Test suite for the cost log kept by shared.cost_control.
+
+Run with:
+    pytest -v tests/test_cost_control.py
+"""
+
+import json
+import os
+import sys
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import shared.cost_control as cost_control
+
+
+@pytest.fixture
+def cost_log(tmp_path, monkeypatch):
+    """Point the cost log at tmp_path and reset the module's state."""
+    monkeypatch.setattr(cost_control, "COST_LOG_PATH", tmp_path / "cost_log.json")
+    monkeypatch.setattr(cost_control, "COST_LOG_JSONL", tmp_path / "cost_log.jsonl")
+    monkeypatch.setattr(cost_control, "COST_LOG_SUMMARY", tmp_path / "cost_log_summary.json")
+    monkeypatch.setattr(cost_control, "_SESSION_COST", 0.0)
+    monkeypatch.setattr(cost_control, "_MIGRATED", False)
+    monkeypatch.setattr(cost_control, "_SUMMARY", None)
+    monkeypatch.setattr(cost_control, "_PENDING", [])
+    monkeypatch.setattr(cost_control, "_PENDING_BYTES", 0)
+    monkeypatch.setattr(cost_control, "_LOG_DIR_READY", None)
+    monkeypatch.setattr(cost_control, "_TODAYS_SPEND", None)
+    monkeypatch.setattr(cost_control, "_ENV_SETTINGS", None)
+    for name in ("NANOBOT_DRY_RUN", "NANOBOT_DAILY_LIMIT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("NANOBOT_SKIP_CONFIRM", "1")
+    return tmp_path
+
+
+def _entry(cost, when=None, operation="generation"):
+    """Build a log entry as track_cost writes it."""
+    return {
+        "timestamp": (when or datetime.now()).isoformat(),
+        "cost": cost,
+        "operation": operation,
+        "details": {},
+    }
+
+
+def _write_lines(path, lines):
+    """Write raw lines to a new file at path (a new inode)."""
+    tmp_path = path.with_suffix(".new")
+    tmp_path.write_text("".join(line + "\n" for line in lines))
+    os.replace(tmp_path, path)
+
+
+def _freeze_now(monkeypatch, now):
+    """Make cost_control's datetime.now() return now."""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now
+    monkeypatch.setattr(cost_control, "datetime", FrozenDatetime)
+
+
+class TestCostLog:
+    """Test suite for the JSONL cost log and its summary sidecar."""
+
+    def test_migrates_old_log(self, cost_log):
+        """Test that entries in cost_log.json move into the JSONL log."""
+        entries = [_entry(0.15), _entry(0.05, operation="edit")]
+        (cost_log / "cost_log.json").write_text(json.dumps({"entries": entries}))
+
+        assert list(cost_control.iter_cost_entries()) == entries
+        assert not (cost_log / "cost_log.json").exists()
+        assert (cost_log / "cost_log.migrated.json").exists()
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.20), "entries": 2}
+
+    def test_migration_keeps_existing_jsonl(self, cost_log):
+        """Test that an existing JSONL log is not overwritten by migration."""
+        (cost_log / "cost_log.json").write_text(json.dumps({"entries": [_entry(1.0)]}))
+        _write_lines(cost_log / "cost_log.jsonl", [json.dumps(_entry(0.15))])
+
+        assert cost_control.get_cost_summary()["total_cost"] == pytest.approx(0.15)
+        assert (cost_log / "cost_log.json").exists()
+
+    def test_appends_one_line_per_entry(self, cost_log):
+        """Test that each entry is appended as one JSON line."""
+        cost_control.append_cost_entry(_entry(0.15))
+        cost_control.append_cost_entry(_entry(0.05))
+
+        lines = (cost_log / "cost_log.jsonl").read_text().splitlines()
+        assert [json.loads(line)["cost"] for line in lines] == [0.15, 0.05]
+
+    def test_summary_after_appends(self, cost_log):
+        """Test that the summary sidecar covers every appended entry."""
+        for cost in (0.15, 0.15, 0.05):
+            cost_control.append_cost_entry(_entry(cost))
+
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.35), "entries": 3}
+        sidecar = json.loads((cost_log / "cost_log_summary.json").read_text())
+        st = os.stat(cost_log / "cost_log.jsonl")
+        assert sidecar["offset"] == st.st_size
+        assert sidecar["inode"] == st.st_ino
+
+    def test_summary_reads_lines_from_other_processes(self, cost_log):
+        """Test that lines appended behind the summary's back are counted."""
+        cost_control.append_cost_entry(_entry(0.15))
+        cost_control.get_cost_summary()
+        with open(cost_log / "cost_log.jsonl", "a") as f:
+            f.write(json.dumps(_entry(0.05)) + "\n")
+
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.20), "entries": 2}
+
+    def test_summary_resets_after_replace(self, cost_log):
+        """Test that a replaced log (new inode) is summed from the start."""
+        for cost in (0.15, 0.15):
+            cost_control.append_cost_entry(_entry(cost))
+        cost_control.get_cost_summary()
+
+        _write_lines(cost_log / "cost_log.jsonl", [json.dumps(_entry(0.05)) for _ in range(5)])
+
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.25), "entries": 5}
+
+    def test_summary_resets_after_truncate(self, cost_log):
+        """Test that a log truncated in place is summed from the start."""
+        for cost in (0.15, 0.15, 0.15):
+            cost_control.append_cost_entry(_entry(cost))
+        cost_control.get_cost_summary()
+
+        with open(cost_log / "cost_log.jsonl", "w") as f:
+            f.write(json.dumps(_entry(0.05)) + "\n")
+
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.05), "entries": 1}
+
+    def test_summary_ignores_bad_sidecar(self, cost_log):
+        """Test that an unreadable sidecar is rebuilt from the log."""
+        cost_control.append_cost_entry(_entry(0.15))
+        (cost_log / "cost_log_summary.json").write_text("[1, 2]")
+        cost_control._SUMMARY = None
+
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.15), "entries": 1}
+
+    def test_bad_and_null_lines(self, cost_log):
+        """Test that unparseable lines and non-numeric costs are skipped."""
+        _write_lines(cost_log / "cost_log.jsonl", [
+            json.dumps(_entry(0.15)),
+            "{not json",
+            json.dumps(_entry(None)),
+            json.dumps(_entry("free")),
+            "[1, 2]",
+            json.dumps(_entry(0.05)),
+        ])
+
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.20), "entries": 2}
+        assert cost_control._get_todays_spend() == pytest.approx(0.20)
+        assert "Total cost: $0.20" in cost_control.get_cost_report()
+
+        # Later appends still flush and update the summary
+        cost_control.append_cost_entry(_entry(0.10))
+        assert cost_control.get_cost_summary()["total_cost"] == pytest.approx(0.30)
+
+    def test_buffered_entries_written_on_flush(self, cost_log):
+        """Test that buffered entries are held until the log is flushed."""
+        cost_control.append_cost_entry(_entry(0.15), buffered=True)
+        assert not (cost_log / "cost_log.jsonl").exists()
+
+        cost_control.flush_cost_log()
+        assert len((cost_log / "cost_log.jsonl").read_text().splitlines()) == 1
+
+    def test_buffered_entries_written_at_cap(self, cost_log, monkeypatch):
+        """Test that the buffer is flushed once it holds enough entries."""
+        monkeypatch.setattr(cost_control, "COST_LOG_MAX_PENDING", 3)
+        for _ in range(3):
+            cost_control.append_cost_entry(_entry(0.15), buffered=True)
+
+        assert len((cost_log / "cost_log.jsonl").read_text().splitlines()) == 3
+        assert cost_control._PENDING == []
+
+    def test_reads_flush_buffered_entries(self, cost_log):
+        """Test that reading the log includes entries still in the buffer."""
+        cost_control.track_cost(0.15, "generation")
+
+        assert cost_control.get_cost_summary()["entries"] == 1
+        assert len(list(cost_control.iter_cost_entries())) == 1
+
+
+class TestCostReport:
+    """Test suite for the cost report window."""
+
+    def test_report_window(self, cost_log):
+        """Test that only entries within the last N days are reported."""
+        now = datetime.now()
+        _write_lines(cost_log / "cost_log.jsonl", [
+            json.dumps(_entry(1.00, now - timedelta(days=30))),
+            json.dumps(_entry(0.50, now - timedelta(days=8))),
+            json.dumps(_entry(0.15, now - timedelta(days=3))),
+            json.dumps(_entry(0.05, now - timedelta(hours=1), operation="edit")),
+        ])
+
+        report = cost_control.get_cost_report(days=7)
+        assert "Total cost: $0.20" in report
+        assert "Number of operations: 2" in report
+        assert "edit: $0.05" in report
+
+        assert "Number of operations: 1" in cost_control.get_cost_report(days=1)
+        assert "Number of operations: 4" in cost_control.get_cost_report(days=60)
+
+    def test_report_parses_other_timestamp_formats(self, cost_log):
+        """Test that timestamps in another layout are still placed in the window."""
+        entry = _entry(0.15)
+        entry["timestamp"] = (datetime.now() - timedelta(days=1)).isoformat(timespec="minutes")
+        _write_lines(cost_log / "cost_log.jsonl", [json.dumps(entry)])
+
+        assert "Number of operations: 1" in cost_control.get_cost_report(days=7)
+
+    def test_report_without_entries(self, cost_log):
+        """Test the messages for a missing, empty and out-of-window log."""
+        assert cost_control.get_cost_report() == "No cost log found."
+
+        _write_lines(cost_log / "cost_log.jsonl", [])
+        assert cost_control.get_cost_report() == "No cost entries found."
+
+        _write_lines(cost_log / "cost_log.jsonl", [json.dumps(_entry(0.15, datetime.now() - timedelta(days=30)))])
+        assert cost_control.get_cost_report(days=7) == "No cost entries found in the last 7 days."
+
+
+class TestTodaysSpend:
+    """Test suite for the daily spend check."""
+
+    def test_counts_only_today(self, cost_log):
+        """Test that entries from earlier days are not counted."""
+        now = datetime.now()
+        _write_lines(cost_log / "cost_log.jsonl", [
+            json.dumps(_entry(1.00, now - timedelta(days=1))),
+            json.dumps(_entry(0.15, now)),
+        ])
+
+        assert cost_control._get_todays_spend() == pytest.approx(0.15)
+
+    def test_resumes_from_last_check(self, cost_log):
+        """Test that later checks add only the entries appended since."""
+        cost_control.append_cost_entry(_entry(0.15))
+        assert cost_control._get_todays_spend() == pytest.approx(0.15)
+
+        cost_control.append_cost_entry(_entry(0.05))
+        assert cost_control._get_todays_spend() == pytest.approx(0.20)
+        assert cost_control._TODAYS_SPEND[2] == os.stat(cost_log / "cost_log.jsonl").st_size
+
+    def test_cache_resets_on_date_change(self, cost_log, monkeypatch):
+        """Test that a check after midnight does not reuse yesterday's total."""
+        day_one = datetime(2026, 3, 1, 23, 59)
+        day_two = datetime(2026, 3, 2, 0, 1)
+        _write_lines(cost_log / "cost_log.jsonl", [json.dumps(_entry(0.15, day_one))])
+
+        _freeze_now(monkeypatch, day_one)
+        assert cost_control._get_todays_spend() == pytest.approx(0.15)
+
+        _freeze_now(monkeypatch, day_two)
+        cost_control.append_cost_entry(_entry(0.05, day_two))
+        assert cost_control._get_todays_spend() == pytest.approx(0.05)
+
+    def test_cache_resets_after_replace(self, cost_log):
+        """Test that a replaced log is read again from the start."""
+        cost_control.append_cost_entry(_entry(0.15))
+        cost_control.append_cost_entry(_entry(0.15))
+        assert cost_control._get_todays_spend() == pytest.approx(0.30)
+
+        _write_lines(cost_log / "cost_log.jsonl", [json.dumps(_entry(0.05)) for _ in range(10)])
+        assert cost_control._get_todays_spend() == pytest.approx(0.50)
+
+    def test_daily_limit(self, cost_log, monkeypatch):
+        """Test the daily limit check against today's spend."""
+        monkeypatch.setenv("NANOBOT_DAILY_LIMIT", "1.00")
+        cost_control.append_cost_entry(_entry(0.90))
+
+        assert not cost_control._would_exceed_daily_limit(0.10)
+        assert cost_control._would_exceed_daily_limit(0.15)
+
+
+class TestSafeApiBatch:
+    """Test suite for running several API calls as one batch."""
+
+    def test_tracks_successful_calls_in_one_write(self, cost_log, monkeypatch):
+        """Test that only successful calls are logged, with one append."""
+        writes = []
+        append = cost_control._atomic_append
+        monkeypatch.setattr(cost_control, "_atomic_append", lambda path, data: (writes.append(data), append(path, data)))
+
+        def generate_image(prompt):
+            if prompt == "bad":
+                raise RuntimeError("failed")
+            return {"prompt": prompt}
+
+        results = cost_control.safe_api_batch([
+            (generate_image, 0.15, "first", ("a",), {}),
+            (generate_image, 0.15, "second", ("bad",), {}),
+            (generate_image, 0.15, "third", ("c",), {}),
+        ])
+
+        assert results[0] == {"prompt": "a"}
+        assert "error" in results[1]
+        assert results[2] == {"prompt": "c"}
+        assert len(writes) == 1
+        assert cost_control.get_cost_summary() == {"total_cost": pytest.approx(0.30), "entries": 2}
+
+    def test_returns_results_when_tracking_fails(self, cost_log, monkeypatch):
+        """Test that a logging error does not lose results already paid for."""
+        def fail(entries):
+            raise OSError("disk full")
+        monkeypatch.setattr(cost_control, "track_cost_batch", fail)
+
+        results = cost_control.safe_api_batch([(lambda: "ok", 0.15, "only", (), {})])
+        assert results == ["ok"]
+
+    def test_dry_run_tracks_nothing(self, cost_log, monkeypatch):
+        """Test that dry run mode neither calls the API nor logs costs."""
+        monkeypatch.setenv("NANOBOT_DRY_RUN", "1")
+
+        results = cost_control.safe_api_batch([(lambda: pytest.fail("called"), 0.15, "only", (), {})])
+        assert results == [{"dry_run": True, "cost_estimate": 0.15}]
+        assert not (cost_log / "cost_log.jsonl").exists()
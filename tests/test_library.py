@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test suite for the reference library's collection index.
+
+Run with:
+    pytest -v tests/test_library.py
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+import pytest
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from afcover.library import ReferenceLibrary, INDEX_FILE, INDEX_MTIME_SLACK_NS
+
+
+def _age(path, seconds=60):
+    """Set path's mtime far enough in the past for the index to cache it."""
+    mtime_ns = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def library(tmp_path):
+    """A library with one aged artist collection holding one image."""
+    lib = ReferenceLibrary(tmp_path)
+    collection = lib.artists_path / "zahir"
+    collection.mkdir()
+    (collection / "one.png").write_bytes(b"png")
+    _age(collection)
+    return lib
+
+
+def _names(paths):
+    """Return the file names of a list of reference paths."""
+    return sorted(os.path.basename(path) for path in paths)
+
+
+def _read_index(lib):
+    """Read the library's on-disk index."""
+    return json.loads((lib.base_path / INDEX_FILE).read_text())
+
+
+class TestCollectionIndex:
+    """Test suite for the mtime-validated collection index."""
+
+    def test_index_saved_for_aged_collection(self, library):
+        """Test that listing an unchanged collection records it in the index."""
+        listed = library.list_collections()
+        assert _names(listed["artists"]["zahir"]) == ["one.png"]
+
+        entry = _read_index(library)["artists/zahir"]
+        assert entry["files"] == ["one.png"]
+        assert entry["mtime"] == os.stat(library.artists_path / "zahir").st_mtime_ns
+
+    def test_index_used_while_mtime_unchanged(self, library):
+        """Test that a fresh index entry is returned without a rescan."""
+        library.list_collections()
+        index = _read_index(library)
+        index["artists/zahir"]["files"] = ["from-index.png"]
+        (library.base_path / INDEX_FILE).write_text(json.dumps(index))
+
+        fresh = ReferenceLibrary(library.base_path)
+        assert _names(fresh.get_artist_references("zahir")) == ["from-index.png"]
+
+    def test_recent_collection_not_indexed(self, library):
+        """Test that a collection changed within the slack is not cached."""
+        collection = library.styles_path / "herat"
+        collection.mkdir()
+        (collection / "two.png").write_bytes(b"png")
+        mtime_ns = time.time_ns() - INDEX_MTIME_SLACK_NS // 2
+        os.utime(collection, ns=(mtime_ns, mtime_ns))
+
+        assert _names(library.list_collections()["styles"]["herat"]) == ["two.png"]
+        index = _read_index(library)
+        assert "artists/zahir" in index
+        assert "styles/herat" not in index
+
+    def test_file_added_after_index_saved(self, library):
+        """Test that a file added after indexing shows up in every lookup."""
+        library.list_collections()
+        (library.artists_path / "zahir" / "zahir-two.png").write_bytes(b"png")
+
+        fresh = ReferenceLibrary(library.base_path)
+        assert _names(fresh.list_collections()["artists"]["zahir"]) == ["one.png", "zahir-two.png"]
+        assert _names(fresh.get_artist_references("zahir")) == ["one.png", "zahir-two.png"]
+        assert _names(fresh.search_references("two")["artists/zahir"]) == ["zahir-two.png"]
+
+    def test_file_added_then_aged(self, library):
+        """Test that a change is seen even once the directory is old again."""
+        library.list_collections()
+        (library.artists_path / "zahir" / "two.png").write_bytes(b"png")
+        _age(library.artists_path / "zahir", seconds=30)
+
+        fresh = ReferenceLibrary(library.base_path)
+        assert _names(fresh.get_artist_references("zahir")) == ["one.png", "two.png"]
+        assert sorted(_read_index(fresh)["artists/zahir"]["files"]) == ["one.png", "two.png"]
+
+    def test_removed_collection_dropped(self, library):
+        """Test that a deleted collection is dropped from listing and index."""
+        collection = library.styles_path / "kabul"
+        collection.mkdir()
+        (collection / "three.png").write_bytes(b"png")
+        _age(collection)
+        library.list_collections()
+        assert "styles/kabul" in _read_index(library)
+
+        shutil.rmtree(collection)
+
+        fresh = ReferenceLibrary(library.base_path)
+        assert "kabul" not in fresh.list_collections()["styles"]
+        assert "styles/kabul" not in _read_index(fresh)
+        assert fresh.get_style_references("kabul") == []
+
+    @pytest.mark.parametrize("content", [
+        "{not json",
+        "[1, 2]",
+        '{"artists/zahir": null}',
+        '{"artists/zahir": {"files": ["ghost.png"]}}',
+        '{"artists/zahir": {"mtime": "x", "files": "ghost.png"}}',
+    ])
+    def test_corrupt_index_falls_back_to_scan(self, library, content):
+        """Test that a corrupt index is ignored and the directory scanned."""
+        (library.base_path / INDEX_FILE).write_text(content)
+
+        fresh = ReferenceLibrary(library.base_path)
+        assert _names(fresh.list_collections()["artists"]["zahir"]) == ["one.png"]
+        assert _read_index(fresh)["artists/zahir"]["files"] == ["one.png"]
+
+    def test_unreadable_index_falls_back_to_scan(self, library):
+        """Test that an index that cannot be opened is treated as empty."""
+        (library.base_path / INDEX_FILE).mkdir()
+
+        fresh = ReferenceLibrary(library.base_path)
+        assert _names(fresh.get_artist_references("zahir")) == ["one.png"]
@@ -8,6 +8,7 @@ Run with:
 
 import os
 import sys
+import itertools
 import pytest
 from pathlib import Path
 
@@ -27,6 +28,12 @@ from afcover.generator import generate_cover
 from shared.api import estimate_cost
 
 
+@pytest.fixture(scope="module")
+def base_prompts():
+    """Default prompt for every style, built once for the module."""
+    return {style_name: build_style_prompt(style_name) for style_name in get_style_names()}
+
+
 class TestStyles:
     """Test suite for Afghan cover art style definitions and generators."""
 
@@ -70,24 +77,25 @@ class TestStyles:
             assert "visual_elements" in regional, f"Regional style {name} is missing 'visual_elements'"
             assert len(regional["visual_elements"]) >= 2, f"Regional style {name} needs at least 2 visual elements"
 
-    def test_style_prompt_generation(self):
+    def test_style_prompt_generation(self, base_prompts):
         """Test that style prompts are generated correctly."""
-        for style_name in get_style_names():
-            prompt = build_style_prompt(style_name)
+        for style_name, prompt in base_prompts.items():
             assert len(prompt) > 100, f"Style {style_name} prompt too short"
             assert style_name in prompt.lower(), f"Style {style_name} name not in prompt"
             assert STYLES[style_name]["name"] in prompt, f"Style {style_name} full name not in prompt"
             assert "color" in prompt.lower(), f"Style {style_name} missing color info"
             
-    def test_style_regional_combinations(self):
-        """Test all style and regional combinations."""
-        for style_name in get_style_names():
-            for regional_name in get_regional_names():
-                prompt = build_style_prompt(style_name, regional=regional_name)
-                assert len(prompt) > 150, f"{style_name}+{regional_name} prompt too short"
-                assert style_name in prompt.lower(), f"Style {style_name} name not in prompt"
-                assert regional_name in prompt.lower(), f"Regional {regional_name} name not in prompt"
-                assert REGIONAL_STYLES[regional_name]["modifier"] in prompt, f"Regional {regional_name} modifier missing"
+    @pytest.mark.parametrize(
+        ("style_name", "regional_name"),
+        list(itertools.product(get_style_names(), get_regional_names())),
+    )
+    def test_style_regional_combinations(self, style_name, regional_name):
+        """Test every style and regional combination."""
+        prompt = build_style_prompt(style_name, regional=regional_name)
+        assert len(prompt) > 150, f"{style_name}+{regional_name} prompt too short"
+        assert style_name in prompt.lower(), f"Style {style_name} name not in prompt"
+        assert regional_name in prompt.lower(), f"Regional {regional_name} name not in prompt"
+        assert REGIONAL_STYLES[regional_name]["modifier"] in prompt, f"Regional {regional_name} modifier missing"
 
     def test_style_occasion_combinations(self):
         """Test style and occasion combinations."""
@@ -106,6 +114,14 @@ class TestStyles:
         for element in custom_elements:
             assert element in prompt, f"Custom element '{element}' not found in prompt"
 
+    def test_prompt_memoized_for_list_and_tuple_elements(self):
+        """Test that list and tuple custom elements share one cached prompt."""
+        from_list = build_style_prompt("modern", custom_elements=["memo element"])
+        from_tuple = build_style_prompt("modern", custom_elements=("memo element",))
+        
+        assert from_list is from_tuple, "Equivalent calls should return the cached prompt"
+        assert "memo element" in from_list
+
     def test_dry_run_generation(self):
         """Test dry run generation with cost estimate."""
         # Skip if no sample image available - this is a dummy path for example
@@ -142,7 +158,7 @@ class TestStyles:
         for name, style in STYLES.items():
             has_afghan_element = False
             # Check in name, description and elements
-            texts_to_check = [style["name"], style["description"]] + style["elements"]
+            texts_to_check = [style["name"], style["description"], *style["elements"]]
             
             for text in texts_to_check:
                 if any(term in text.lower() for term in ["afghan", "افغان", "dari", "pashto", "nastaliq", "kabul"]):
@@ -157,10 +173,10 @@ class TestStyles:
             build_style_prompt("non_existent_style")
 
     @pytest.mark.parametrize("style_name", ["traditional", "modern", "fusion"])
-    def test_typography_inclusion(self, style_name):
+    def test_typography_inclusion(self, style_name, base_prompts):
         """Test typography inclusion/exclusion in prompts."""
-        # With typography
-        prompt_with_typo = build_style_prompt(style_name, include_typography=True)
+        # With typography (the default)
+        prompt_with_typo = base_prompts[style_name]
         assert "typography" in prompt_with_typo.lower(), f"Style {style_name} missing typography with flag enabled"
         
         # Without typography